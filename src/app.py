@@ -9,6 +9,8 @@ from src.settings.app_settings import AppSettings
 from src.orchestrators.graph import ProjectPlannerGraph
 from src.routers.app_invoke import AppInvoke
 from src.services.project_planner import ProjectPlannerService
+from src.services.planning_jobs import PlanningJobService
+from src.services.input_files import InputFileService
 from src.models.graph_state import GraphState
 
 
@@ -22,7 +24,17 @@ class ProjectPlannerApp:
 
         self.app_orchestration = ProjectPlannerService(graph_app=self.graph, settings=self.settings)
 
-        self.app_invoke_router = AppInvoke(service=self.app_orchestration)
+        self.planning_jobs = PlanningJobService(
+            service=self.app_orchestration, settings=self.settings, logger=self.logger
+        )
+
+        self.input_files = InputFileService(settings=self.settings, logger=self.logger)
+
+        self.app_invoke_router = AppInvoke(
+            service=self.app_orchestration,
+            job_service=self.planning_jobs,
+            input_service=self.input_files,
+        )
 
         # self.os_client = self.get_os_client()
         # self.async_os_client = self.get_async_os_client()
@@ -112,6 +124,8 @@ class ProjectPlannerApp:
     async def stop(self):
         """stop stops the app"""
         await self.rest_server.shutdown()
+        # Joins the Jira outbox flusher, keep that off the event loop
+        await asyncio.to_thread(self.graph_manager.shutdown)
         # await self.async_os_client.close()
         # self.os_client.close()
 
@@ -0,0 +1,151 @@
+from datetime import date
+from typing import Dict, List, NamedTuple
+
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+
+from src.models.employee import Employee
+
+UNITS_PER_DAY = 2  # half-day resolution
+
+
+class Reservation(NamedTuple):
+    row: int
+    columns: np.ndarray
+    units: np.ndarray
+    overbooked: int
+    overbooked_column: int
+
+
+class CapacityMatrix(BaseModel):
+    """
+    Free capacity of each employee on each working day, in half-day units.
+
+    Rows follow emp_ids and columns follow days (working days only). Row prefix sums
+    answer range queries in O(1) and are refreshed per row on reserve/release.
+    Date ranges are half-open, [start, end). Only emp_ids and days are serialized.
+
+    Work booked beyond the free capacity of a reservation window is recorded on the
+    window's last working day, so it only lowers the ranges that include that day.
+    """
+
+    emp_ids: List[str]
+    days: List[date]
+    _free: np.ndarray = PrivateAttr()
+    _prefix: np.ndarray = PrivateAttr()
+    _overbooked: np.ndarray = PrivateAttr()
+    _rows: Dict[str, int] = PrivateAttr()
+    _day_numbers: np.ndarray = PrivateAttr()
+
+    def model_post_init(self, __context):
+        self._rows = {emp_id: row for row, emp_id in enumerate(self.emp_ids)}
+        self._day_numbers = np.array(self.days, dtype="datetime64[D]")
+        self._free = np.full(
+            (len(self.emp_ids), len(self.days)), UNITS_PER_DAY, dtype=np.int16
+        )
+        self._overbooked = np.zeros((len(self.emp_ids), len(self.days)), dtype=np.int64)
+        self._prefix = np.zeros((len(self.emp_ids), len(self.days) + 1), dtype=np.int64)
+        self.refresh()
+
+    @classmethod
+    def build(cls, employee_data: Dict[str, Employee], calendar, start: date, end: date):
+        """
+        Full capacity on every working day of the WorkingCalendar in [start, end),
+        minus each employee's leave days.
+        """
+        matrix = cls(
+            emp_ids=list(employee_data.keys()),
+            days=calendar.working_days(start, end).tolist(),
+        )
+        employees = list(employee_data.values())
+        rows = np.repeat(
+            np.arange(len(employees)), [len(employee.leave_days) for employee in employees]
+        )
+        leave_days = np.array(
+            [day for employee in employees for day in employee.leave_days],
+            dtype="datetime64[D]",
+        )
+        columns = np.searchsorted(matrix._day_numbers, leave_days)
+        on_working_day = columns < len(matrix.days)
+        on_working_day[on_working_day] = (
+            matrix._day_numbers[columns[on_working_day]] == leave_days[on_working_day]
+        )
+        matrix._free[rows[on_working_day], columns[on_working_day]] = 0
+        matrix.refresh()
+        return matrix
+
+    def refresh(self, row: int = None):
+        """Recompute prefix sums, of one row or all"""
+        if row is None:
+            np.cumsum(self._free - self._overbooked, axis=1, out=self._prefix[:, 1:])
+        else:
+            np.cumsum(self._free[row] - self._overbooked[row], out=self._prefix[row, 1:])
+
+    def get_columns(self, start: date, end: date):
+        bounds = np.searchsorted(
+            self._day_numbers, np.array([start, end], dtype="datetime64[D]")
+        )
+        return int(bounds[0]), int(bounds[1])
+
+    def available(self, emp_id: str, start: date, end: date) -> float:
+        """Free days of one employee in [start, end), negative when overbooked"""
+        first, last = self.get_columns(start, end)
+        row = self._rows[emp_id]
+        return (self._prefix[row, last] - self._prefix[row, first]) / UNITS_PER_DAY
+
+    def available_all(self, start: date, end: date) -> Dict[str, float]:
+        """Free days of every employee in [start, end)"""
+        first, last = self.get_columns(start, end)
+        units = self._prefix[:, last] - self._prefix[:, first]
+        return dict(zip(self.emp_ids, (units / UNITS_PER_DAY).tolist()))
+
+    def working_days(self, start: date, end: date) -> int:
+        first, last = self.get_columns(start, end)
+        return last - first
+
+    def reserve(self, emp_id: str, days: float, start: date, end: date) -> Reservation:
+        """
+        Book days of work on the employee's earliest free half-days in [start, end).
+        Work that does not fit is recorded as overbooked rather than refused, on the last
+        working day of the window (or the one before it when the window has none).
+        """
+        row = self._rows[emp_id]
+        first, last = self.get_columns(start, end)
+        needed = int(round(days * UNITS_PER_DAY))
+
+        free = self._free[row, first:last]
+        # Units taken from each day: fill days in order until the need is covered
+        taken_before = np.concatenate(([0], np.cumsum(free)[:-1]))
+        units = np.clip(needed - taken_before, 0, free).astype(np.int16)
+        columns = np.nonzero(units)[0] + first
+        units = units[units > 0]
+
+        self._free[row, columns] -= units
+        overbooked = needed - int(units.sum())
+        overbooked_column = max(last - 1, 0)
+        if overbooked and len(self.days):
+            self._overbooked[row, overbooked_column] += overbooked
+        self.refresh(row)
+        return Reservation(row, columns, units, overbooked, overbooked_column)
+
+    def release(self, reservation: Reservation):
+        row = reservation.row
+        self._free[row, reservation.columns] += reservation.units
+        if reservation.overbooked and len(self.days):
+            self._overbooked[row, reservation.overbooked_column] -= reservation.overbooked
+        self.refresh(row)
+
+    def snapshot(self) -> "CapacityMatrix":
+        """Independent copy for what-if planning, the shared metadata is not copied"""
+        copy = self.model_copy()
+        copy._free = self._free.copy()
+        copy._prefix = self._prefix.copy()
+        copy._overbooked = self._overbooked.copy()
+        return copy
+
+    def get_bandwidth(self, employee_data: Dict[str, Employee], start: date, end: date):
+        """The employee_bandwidth view of [start, end) the prompts and state use"""
+        return {
+            emp_id: {"employee_name": employee_data[emp_id].name, "bandwidth": bandwidth}
+            for emp_id, bandwidth in self.available_all(start, end).items()
+        }
@@ -1,5 +1,8 @@
+from bisect import bisect_left, bisect_right
+from datetime import date
+from functools import cached_property
 from typing import List
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from src.models.skill import Skill
 from src.models.leave import Leave
 
@@ -10,3 +13,18 @@ class Employee(BaseModel):
     email: str
     skills: List[Skill]
     leave_plans: List[Leave]
+
+    @field_validator("leave_plans")
+    @classmethod
+    def sort_leave_plans(cls, leave_plans: List[Leave]) -> List[Leave]:
+        return sorted(leave_plans, key=lambda leave: leave.date)
+
+    @cached_property
+    def leave_days(self) -> List[date]:
+        """Leave dates in ascending order"""
+        return [leave.date for leave in self.leave_plans]
+
+    def count_leaves(self, start_date: date, end_date: date) -> int:
+        """Leave days in [start_date, end_date], by bisection of the sorted dates"""
+        leave_days = self.leave_days
+        return bisect_right(leave_days, end_date) - bisect_left(leave_days, start_date)
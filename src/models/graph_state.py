@@ -8,6 +8,9 @@ from src.models.sprint import Sprint
 from src.models.project_plan import ProjectPlan
 from src.models.story import Story
 from src.models.epic import Epic
+from src.models.capacity_matrix import CapacityMatrix
+from src.utils.skill_index import SkillIndex
+from datetime import date
 
 
 class GraphState(TypedDict):
@@ -15,6 +18,7 @@ class GraphState(TypedDict):
     kwargs: Any
     project_data: Dict[str, Task]
     employee_data: Dict[str, Employee]
+    skill_index: SkillIndex
     next_sprint: Sprint
     project_plan: ProjectPlan
     stories: Union[List[Story], Dict[str, Story]]
@@ -24,4 +28,7 @@ class GraphState(TypedDict):
     should_end: bool
     next_node: str
     employee_bandwidth: Dict[str, Dict]
+    capacity: CapacityMatrix
+    project_start_date: date
+    project_end_date: date
     available_sprint_days_count: Any
@@ -0,0 +1,32 @@
+from typing import List
+from pydantic import BaseModel, Field
+from src.models.malformed_row import MalformedRow
+
+
+class IngestionReport(BaseModel):
+    """Rows of an input file that were loaded and the ones that were skipped or repaired"""
+
+    source: str
+    rows: int = 0
+    loaded: int = 0
+    malformed: List[MalformedRow] = Field(default_factory=list)
+
+    def add(self, rows, column: str, values, reason: str):
+        """Record a batch of malformed cells, rows are the 1-based data rows of the file"""
+        self.malformed.extend(
+            MalformedRow(source=self.source, row=int(row), column=column, value=str(value), reason=reason)
+            for row, value in zip(rows, values)
+        )
+
+    def summary(self, limit: int = 20) -> str:
+        lines = [
+            f"{self.source}: loaded {self.loaded} of {self.rows} rows, "
+            f"{len(self.malformed)} malformed cells"
+        ]
+        lines.extend(
+            f"  row {entry.row} {entry.column}={entry.value!r}: {entry.reason}"
+            for entry in self.malformed[:limit]
+        )
+        if len(self.malformed) > limit:
+            lines.append(f"  ... {len(self.malformed) - limit} more")
+        return "\n".join(lines)
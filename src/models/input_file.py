@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class InputFile(BaseModel):
+    kind: str
+    path: str
+    size: int
+    sha256: str
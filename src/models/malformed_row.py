@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class MalformedRow(BaseModel):
+    source: str
+    row: int
+    column: str
+    value: str
+    reason: str
@@ -0,0 +1,28 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class JobStatus(str, Enum):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    SUCCEEDED = "Succeeded"
+    FAILED = "Failed"
+
+
+class JobProgress(BaseModel):
+    node: str
+    next_node: Optional[str] = None
+    timestamp: datetime
+
+
+class PlanningJob(BaseModel):
+    run_id: str
+    status: JobStatus
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: List[JobProgress] = Field(default_factory=list)
+    result: Optional[Any] = None
+    error: Optional[str] = None
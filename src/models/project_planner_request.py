@@ -1,7 +1,10 @@
+from typing import Optional
 from pydantic import BaseModel
 
 
 class ProjectPlannerRequest(BaseModel):
     project_name: str
     project_desc: str
-    csv_path: str
+    # Task and roster files for this request, CSV_PATH and EMPLOYEE_DATA when not given
+    csv_path: Optional[str] = None
+    roster_path: Optional[str] = None
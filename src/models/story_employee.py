@@ -5,4 +5,4 @@ from src.models.story import Story
 
 
 class EmployeeStory(BaseModel):
-     story_employee_mapping : dict = Field(description="mapping of issue_id of a story to emp_id of an employee")
+     story_employee_mapping : dict = Field(description="mapping of the id of a story (S1, S2, ...) to the id of an employee (E1, E2, ...)")
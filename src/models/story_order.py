@@ -5,5 +5,5 @@ from pydantic import BaseModel, Field
 
 class StoryOrder(BaseModel):
     stories: List[str] = Field(
-        description="List of issue_ids in their order of required completion"
+        description="List of story ids (S1, S2, ...) in their order of required completion"
     )
@@ -1,6 +1,8 @@
 from datetime import datetime
+from operator import itemgetter
 from typing import Literal, List
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langchain_core.runnables import RunnableParallel
 from langgraph.types import Command
 from src.utils.chat_watsonx_llm import ChatLLMInstance
 from src.models.graph_state import GraphState
@@ -38,40 +40,76 @@ class EpicStories:
     def identify_epics_stories(self, state: GraphState):
         # self.logger(f"Inside Identify for {state['kwargs']}")
         if self.settings.MODE == "Prod":
-            self.logger.info(f"Identifying Epics")
-            epic_chain = self.get_chain(PROMPT_TEMPLATE_EPIC, EpicList)
-            areas = list(state["project_data"].keys())
-
-            epics_list = epic_chain.invoke(
-                input={
-                    "project_name": state["input"].project_name,
-                    "project_description": state["input"].project_desc,
-                    "area": areas,
-                }
+            self.logger.info(
+                f"Identifying Epics and Stories for {len(state['project_data'])} areas"
             )
+            result = self.get_plan_chain().invoke(
+                input=self.get_plan_input(state), config=self.get_plan_config()
+            )
+            return self.merge_epics_stories(state, result)
+        return {"next_node": "estimate_sprint_count"}
 
-            story_chain = self.get_chain(PROMPT_TEMPLATE, StoryList)
-            final_stories_list = []
-
-            for area, tasks in state["project_data"].items():
-                self.logger.info(f"Identifying Stories for {area}")
-                story_list = story_chain.invoke(
-                    input={
-                        "project_name": state["input"].project_name,
-                        "project_description": state["input"].project_desc,
-                        "area": tasks.area,
-                        "subtasks": tasks.subtask,
-                    }
-                )
-                for epic in epics_list.epics:
-                    if epic.title.lower() == area.lower():
-                        epic.stories = story_list.stories
-
-                final_stories_list.extend(story_list.stories)
-
-            return {"epics": epics_list.epics, "stories": final_stories_list, 'next_node': 'estimate_sprint_count'}
+    async def aidentify_epics_stories(self, state: GraphState):
+        """Async variant of identify_epics_stories"""
+        if self.settings.MODE == "Prod":
+            self.logger.info(
+                f"Identifying Epics and Stories for {len(state['project_data'])} areas"
+            )
+            result = await self.get_plan_chain().ainvoke(
+                input=self.get_plan_input(state), config=self.get_plan_config()
+            )
+            return self.merge_epics_stories(state, result)
         return {"next_node": "estimate_sprint_count"}
 
+    def get_plan_chain(self):
+        """Epic chain and one story chain per area, all fanned out together"""
+        epic_chain = self.get_chain(PROMPT_TEMPLATE_EPIC, EpicList)
+        story_chain = self.get_chain(PROMPT_TEMPLATE, StoryList)
+        return RunnableParallel(
+            epics=itemgetter("epics") | epic_chain,
+            stories=itemgetter("stories") | story_chain.map(),
+        )
+
+    def get_plan_config(self):
+        return {"max_concurrency": self.settings.STORY_CHAIN_CONCURRENCY}
+
+    def get_plan_input(self, state: GraphState):
+        return {
+            "epics": self.get_epic_input(state),
+            "stories": [
+                self.get_story_input(state, tasks)
+                for tasks in state["project_data"].values()
+            ],
+        }
+
+    def get_epic_input(self, state: GraphState):
+        return {
+            "project_name": state["input"].project_name,
+            "project_description": state["input"].project_desc,
+            "area": list(state["project_data"].keys()),
+        }
+
+    def get_story_input(self, state: GraphState, tasks):
+        return {
+            "project_name": state["input"].project_name,
+            "project_description": state["input"].project_desc,
+            "area": tasks.area,
+            "subtasks": tasks.subtask,
+        }
+
+    def merge_epics_stories(self, state: GraphState, result):
+        """Attach each area's stories to its epic, keeping the area order"""
+        epics_list = result["epics"]
+        final_stories_list = []
+        for area, story_list in zip(state["project_data"].keys(), result["stories"]):
+            for epic in epics_list.epics:
+                if epic.title.lower() == area.lower():
+                    epic.stories = story_list.stories
+
+            final_stories_list.extend(story_list.stories)
+
+        return {"epics": epics_list.epics, "stories": final_stories_list, 'next_node': 'estimate_sprint_count'}
+
     def get_chain(self, prompt_template, model):
         chain = prompt_template | self.chat_llm.with_structured_output(model)
         return chain
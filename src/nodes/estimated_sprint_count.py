@@ -4,6 +4,9 @@ import requests
 from typing import Dict, List, Literal
 from langgraph.types import Command
 from src.utils.calender import PublicHolidayUtils
+from src.utils.working_calendar import WorkingCalendar
+from src.models.capacity_matrix import CapacityMatrix
+from src.settings.app_settings import AppSettings
 from src.models.graph_state import GraphState, Employee
 from src.models.skill import Skill
 from src.models.leave import Leave
@@ -11,8 +14,9 @@ from src.models.employee import Employee
 from src.models.sprint import Sprint
 
 class EstimatedSprintCount:
-    def __init__(self, country_code: str, logger):
-        self.calendar_api = PublicHolidayUtils(country_code)
+    def __init__(self, country_code: str, settings: AppSettings, logger):
+        self.settings = settings
+        self.calendar_api = PublicHolidayUtils.from_settings(country_code, self.settings, logger)
         self.logger = logger
 
     def utils_manager(self, state: GraphState)-> Command[Literal["estimate_sprint_count", "employee_bandwidth_for_sprint"]]:
@@ -38,119 +42,72 @@ class EstimatedSprintCount:
         estimated_days = total_points // num_employees
         self.logger.info(f"estimated: {estimated_days}")
 
-        # Step 4: Fetch public holidays from tomorrow for estimated_days duration
+        # Step 4: Fetch public holidays from tomorrow, covering the estimate and the first sprint
         start_date = datetime.date.today() + timedelta(days=1)
-        end_date = start_date + timedelta(days=int(2 * estimated_days))
-        public_holidays = set(
-            self.calendar_api.get_public_holidays(start_date, end_date)
+        sprint_end = start_date + timedelta(days=self.settings.SPRINT_LENGTH_DAYS)
+        calendar = self.get_calendar(
+            start_date, max(start_date + timedelta(days=int(2 * estimated_days)), sprint_end)
         )
-        # num_holidays = len(public_holidays)
 
-        # Step 5: Adjust estimated days to include public holidays
-        # final_days_needed = estimated_days + num_holidays
+        # Step 5: The project ends once estimated_days working days have passed
+        end_date, available_days = calendar.end_date(start_date, estimated_days)
 
-        end_date, available_days = self.calculate_end_date(
-            start_date=start_date,
-            estimated_days=estimated_days,
-            public_holidays=public_holidays,
+        # Step 6: Build the team capacity matrix once, every later node reads from it
+        capacity = CapacityMatrix.build(
+            state["employee_data"], calendar, start_date, max(end_date, sprint_end)
         )
+        available_sprint_days = capacity.working_days(start_date, sprint_end)
+        self.trace_leaves(state["employee_data"], capacity, start_date, end_date)
 
-        # Step 6: Compute available days in a sprint (next 14 days)
-        sprint_start = start_date
-        sprint_end = sprint_start + timedelta(days=14)
-
-        # Remove weekends (Saturdays & Sundays)
-        available_sprint_days = [
-            sprint_start + timedelta(days=i)
-            for i in range(14)
-            if (sprint_start + timedelta(days=i)).weekday() < 5  # 0-4 are weekdays
-        ]
-
-        # Employee bandwidth calculation
-        employee_bandwidth = {}
+        # Employee bandwidth: working days in the project minus each employee's leave
+        employee_bandwidth = capacity.get_bandwidth(state["employee_data"], start_date, end_date)
         for emp_id, employee in state["employee_data"].items():
-            # Count the number of leaves for each employee within the project duration (from tomorrow to final_days_needed)
-            leave_count = self.count_leaves_in_range(employee, start_date, end_date)
-
-            # Calculate the bandwidth: final_days_needed - leave_count
-            bandwidth = available_days - leave_count
-            employee_bandwidth[emp_id] = {
-                "employee_name": employee.name,
-                "bandwidth": bandwidth,
-                "skills": employee.skills,
-            }
-
-        self.logger.info(f"len of available days for project: available_days")
-
-        # Remove public holidays from available days
-        available_sprint_days = [
-            day for day in available_sprint_days if day not in public_holidays
-        ]
+            employee_bandwidth[emp_id]["skills"] = employee.skills
+
+        self.logger.info(f"len of available days for project: {available_days}")
         self.logger.info(f"available days for next sprint: {available_sprint_days}")
         self.logger.info(f"bandwidth: {employee_bandwidth}")
 
         return {
-            "available_sprint_days_count": len(available_sprint_days),
+            "available_sprint_days_count": available_sprint_days,
             "employee_bandwidth": employee_bandwidth,
+            "capacity": capacity,
+            "project_start_date": start_date,
+            "project_end_date": end_date,
             "next_node": "create_jira_issues"
         }
 
     def employee_bandwidth_for_next_sprint(self, state: GraphState):
-        """Calculate Employee bandwidth for next sprint"""
+        """Calculate Employee bandwidth for next sprint from the capacity matrix"""
 
-        sprint_duration = 14
+        sprint_duration = self.settings.SPRINT_LENGTH_DAYS
 
-        start_date = datetime.date.today() + timedelta(days=1)
+        start_date = state["project_start_date"]
         end_date = start_date + timedelta(days=sprint_duration)
 
-        employee_bandwidth = {}
-        for emp_id, employee in state["employee_data"].items():
-            leave_count = self.count_leaves_in_range(employee, start_date, end_date)
-
-            bandwidth = sprint_duration - leave_count - 4
-            employee_bandwidth[emp_id] = {
-                "employee_name": employee.name,
-                "bandwidth": bandwidth,
-            }
+        employee_bandwidth = state["capacity"].get_bandwidth(
+            state["employee_data"], start_date, end_date
+        )
         
         sprint = Sprint(id = 1, name="Sprint 1", startDate=start_date, endDate=end_date, goal="", stories={})
 
         return {"employee_bandwidth": employee_bandwidth, "next_node": "plan_next_sprint", "next_sprint": sprint}
 
-    def count_leaves_in_range(
-        self, employee: Employee, start_date: date, end_date: date
-    ) -> int:
-        """
-        Counts the number of leave days for the employee in the given date range.
-        """
-        leave_count = 0
-        self.logger.info(f"employee leave plan:{employee.leave_plans}")
-        for leave in employee.leave_plans:
-            self.logger.info(f"start_date:{start_date}")
-            self.logger.info(f"leave_date:{leave.date}")
-            self.logger.info(f"end_date:{end_date}")
-            if start_date <= leave.date <= end_date:
-                leave_count += 1
-            self.logger.info(f"leave count of {employee.email} is {leave_count}")
-        return leave_count
-
-    def calculate_end_date(self, start_date: date, estimated_days, public_holidays):
-        """
-        Calculates the end date by considering only working days (excluding weekends and public holidays).
-
-        :param start_date: The starting date (datetime.date)
-        :param estimated_days: Number of working days needed
-        :param public_holidays: Set of public holidays (datetime.date)
-        :return: Adjusted end_date
-        """
-        current_date = start_date
-        workdays_count = 0
-
-        while workdays_count < estimated_days:
-            # Check if the day is a weekday and not a public holiday
-            if current_date.weekday() < 5 and current_date not in public_holidays:
-                workdays_count += 1
-            # Move to the next day
-            current_date += timedelta(days=1)
-
-        return current_date, workdays_count
+    def get_calendar(self, start_date: date, end_date: date) -> WorkingCalendar:
+        """Working-day calendar with the public holidays between start_date and end_date"""
+        return WorkingCalendar(self.calendar_api.get_public_holidays(start_date, end_date))
+
+    def trace_leaves(
+        self, employee_data: Dict[str, Employee], capacity: CapacityMatrix, start_date: date, end_date: date
+    ):
+        """Debug trace of each employee's leave in [start_date, end_date), with LEAVE_TRACE"""
+        if not self.settings.LEAVE_TRACE:
+            return
+        working_days = capacity.working_days(start_date, end_date)
+        for emp_id, employee in employee_data.items():
+            leave_count = employee.count_leaves(start_date, end_date - timedelta(days=1))
+            self.logger.debug(
+                f"leave count of {employee.email} in {start_date}..{end_date} is {leave_count} "
+                f"of {len(employee.leave_days)}, "
+                f"{working_days - capacity.available(emp_id, start_date, end_date):g} on working days"
+            )
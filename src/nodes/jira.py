@@ -1,3 +1,4 @@
+import asyncio
 from copy import deepcopy
 from typing import Dict, List, Literal
 from langgraph.types import Command
@@ -5,15 +6,32 @@ from src.nodes.read_csv import CSVProcessor
 from src.settings.app_settings import AppSettings
 from src.models.graph_state import GraphState
 from src.utils.jira import JiraUtils
+from src.utils.async_jira import AsyncJiraUtils
+from src.utils.jira_outbox import JiraOutbox, JiraOutboxFlusher
 
 
 class JiraNode:
     def __init__(self, settings: AppSettings, logger):
         self.settings = settings
         self.logger = logger
-        self.jira_utils = JiraUtils(
-            self.settings.JIRA_EMAIL, self.settings.JIRA_API_TOKEN, self.logger
+        self.outbox = None
+        self.outbox_flusher = None
+        if self.settings.JIRA_OUTBOX_ENABLED:
+            self.outbox = JiraOutbox(self.settings.JIRA_OUTBOX_PATH, self.logger)
+        self.jira_utils = JiraUtils.from_settings(self.settings, self.logger, outbox=self.outbox)
+        self.async_jira_utils = AsyncJiraUtils(
+            self.jira_utils, max_in_flight=self.settings.JIRA_MAX_IN_FLIGHT
         )
+        if self.outbox:
+            # Also resumes whatever a previous process left unsent
+            self.outbox_flusher = JiraOutboxFlusher(
+                self.outbox,
+                self.jira_utils,
+                batch_size=self.settings.JIRA_OUTBOX_BATCH_SIZE,
+                max_attempts=self.settings.JIRA_OUTBOX_MAX_ATTEMPTS,
+                logger=self.logger,
+            )
+            self.outbox_flusher.start()
 
     def jira_manager(
         self, state: GraphState
@@ -25,19 +43,72 @@ class JiraNode:
         Reads epics and tasks from CSV and creates Jira issues.
         """
         stories_dict = self.jira_utils.process_epics_and_tasks(
-            state["epics"], state["stories"]
+            state["epics"],
+            state["stories"],
+            bulk=self.settings.JIRA_BULK_CREATE,
+            reconcile=self.settings.JIRA_RECONCILE,
+            scope=state["input"].project_name,
+        )
+        return {"stories": stories_dict, "next_node": "order_stories"}
+
+    async def acreate_jira_issues(self, state: GraphState):
+        """Async variant of create_jira_issues, stories are created concurrently"""
+        if self.outbox:
+            return await asyncio.to_thread(self.create_jira_issues, state)
+        stories_dict = await self.async_jira_utils.process_epics_and_tasks(
+            state["epics"],
+            state["stories"],
+            bulk=self.settings.JIRA_BULK_CREATE,
+            reconcile=self.settings.JIRA_RECONCILE,
+            scope=state["input"].project_name,
         )
         return {"stories": stories_dict, "next_node": "order_stories"}
 
     def assign_story_jira(self, state: GraphState):
         """
         Assign each story in the state to an employee in Jira.
+        With the outbox the assignments are handed off to its flusher.
+        """
+        stories = self.get_assignee_stories(state)
+        if not self.outbox:
+            self.jira_utils.warm_account_ids([story.assignee for story in stories])
+        self.jira_utils.assign_stories(stories)
+        return {"next_node": "employee_bandwidth_for_sprint"}
+
+    async def aassign_story_jira(self, state: GraphState):
+        """Async variant of assign_story_jira, stories are assigned concurrently"""
+        if self.outbox:
+            return await asyncio.to_thread(self.assign_story_jira, state)
+        stories = self.get_assignee_stories(state)
+        await asyncio.to_thread(
+            self.jira_utils.warm_account_ids, [story.assignee for story in stories]
+        )
+        await self.async_jira_utils.assign_stories(stories)
+        return {"next_node": "employee_bandwidth_for_sprint"}
+
+    def close(self):
+        """
+        Stop the outbox flusher and release the Jira session. Both are closed only once
+        the flusher thread is done, by that thread when its last batch outlasts the stop.
         """
+        if self.outbox_flusher:
+            self.outbox_flusher.stop(on_exit=self.close_clients)
+        else:
+            self.close_clients()
+
+    def close_clients(self):
+        self.jira_utils.close()
+        if self.outbox:
+            self.outbox.close()
+
+    def get_assignee_stories(self, state: GraphState):
+        """Copies of the stories with the assignee emp_id swapped for their email"""
+        stories = []
         for story in state["stories"].values():
             temp_story = deepcopy(story)
             temp_story.assignee = state["employee_data"].get(story.assignee, "").email
-            self.jira_utils.assign_story(temp_story)
-        return {"next_node": "employee_bandwidth_for_sprint"}
+            stories.append(temp_story)
+        return stories
 
     def create_sprint(self, state: GraphState):
         """
@@ -48,6 +119,15 @@ class JiraNode:
 
         return {"next_node": "__end__"}
 
+    async def acreate_sprint(self, state: GraphState):
+        """Async variant of create_sprint, stories are moved into the sprint concurrently"""
+        if self.outbox:
+            return await asyncio.to_thread(self.create_sprint, state)
+        await asyncio.to_thread(self.jira_utils.create_sprint, state["next_sprint"])
+        await self.async_jira_utils.assign_stories_to_sprint(state["next_sprint"])
+
+        return {"next_node": "__end__"}
+
     
     def assign_stories_to_sprint(self, state: GraphState):
         """
@@ -2,43 +2,58 @@ from langchain_core.prompts import PromptTemplate
 from src.utils.chat_watsonx_llm import ChatLLMInstance
 from src.models.graph_state import GraphState
 from src.models.story_order import StoryOrder
+from src.settings.app_settings import AppSettings
+from src.utils.prompt_encoding import PromptEncoder
 
 
 PROMPT_TEMPLATE = PromptTemplate.from_template(
     "This is the name of the Project: {project_name}, this is its description: {project_description}.\
     Your job is to order the Stories in the sequence of their completion. Make sure you not what stories needs to be finished before what.\
-    These are all the stories: {stories}. Return just the list of issue_id in the order of their required completion. \
+    These are all the stories:\n{stories}\nReturn just the list of story ids (S1, S2, ...) in the order of their required completion. \
         Take care of all the dependencies between the stories too "
 )
 
 
 class OrderStories:
-    def __init__(self, chat_llm: ChatLLMInstance, logger):
+    def __init__(self, chat_llm: ChatLLMInstance, logger, settings: AppSettings):
         self.chat_llm = chat_llm
         self.logger = logger
+        self.settings = settings
 
     def order_stories(self, state: GraphState):
-        story_list = [
-            {
-                "issue_id": key,
-                "epic": story.epic,
-                "title": story.title,
-                "description": story.description,
-            }
-            for key, story in state["stories"].items()
-        ]
         chain = self.get_chain()
+        encoder = self.get_encoder()
+        result = chain.invoke(input=self.get_input(state, encoder))
+        return self.reorder(state, result, encoder)
 
-        result = chain.invoke(
-            input={
-                "project_name": state["input"].project_name,
-                "project_description": state["input"].project_desc,
-                "stories": story_list,
-            }
+    async def aorder_stories(self, state: GraphState):
+        """Async variant of order_stories"""
+        chain = self.get_chain()
+        encoder = self.get_encoder()
+        result = await chain.ainvoke(input=self.get_input(state, encoder))
+        return self.reorder(state, result, encoder)
+
+    def get_encoder(self) -> PromptEncoder:
+        return PromptEncoder(
+            self.settings.PROMPT_DESCRIPTION_CHARS,
+            self.settings.PROMPT_STORY_TOKEN_BUDGET,
+            self.logger,
         )
 
+    def get_input(self, state: GraphState, encoder: PromptEncoder):
+        prompt_input = {
+            "project_name": state["input"].project_name,
+            "project_description": state["input"].project_desc,
+            "stories": encoder.encode_stories(list(state["stories"].values())),
+        }
+        encoder.log_size("Order stories", prompt_input)
+        return prompt_input
+
+    def reorder(self, state: GraphState, result: StoryOrder, encoder: PromptEncoder):
         reordered_dict = {
-            key: state["stories"][key] for key in result.stories if key in state["stories"]
+            key: state["stories"][key]
+            for key in encoder.decode_stories(result.stories)
+            if key in state["stories"]
         }
 
         return {"stories": reordered_dict, "next_node": "story_assignee"}
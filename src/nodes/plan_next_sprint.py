@@ -14,22 +14,32 @@ class PlanNextSprint:
         Stories are assigned sequentially based on their order in the state['stories'].
         """
         assigned_stories = {}
+        capacity = state["capacity"]
+        sprint_start = state["next_sprint"].startDate
+        sprint_end = state["next_sprint"].endDate
 
         for story in state["stories"].values():
             emp_id = story.assignee
             estimate = story.estimate
 
             if emp_id in state["employee_bandwidth"]:
-                remaining_bandwidth = state["employee_bandwidth"][emp_id]["bandwidth"]
+                remaining_bandwidth = capacity.available(emp_id, sprint_start, sprint_end)
 
                 # Ensure story fits within the remaining bandwidth
                 if estimate <= remaining_bandwidth:
                     assigned_stories[story.issue_id] = story
-                    state["employee_bandwidth"][emp_id]["bandwidth"] -= estimate
+                    capacity.reserve(emp_id, estimate, sprint_start, sprint_end)
+                    state["employee_bandwidth"][emp_id]["bandwidth"] = capacity.available(
+                        emp_id, sprint_start, sprint_end
+                    )
                 else:
                     # If the story can't fit, stop assigning further (as order matters)
                     break
 
         state['next_sprint'].stories = assigned_stories
 
-        return {"next_sprint": state['next_sprint'], "next_node": "create_and_update_sprint"}
+        return {
+            "next_sprint": state['next_sprint'],
+            "capacity": capacity,
+            "next_node": "create_and_update_sprint",
+        }
@@ -1,9 +1,12 @@
-from langgraph.prebuilt import create_react_agent
+from typing import Dict
 from src.utils.jira import JiraUtils
 from src.settings.app_settings import AppSettings
 from src.models.graph_state import GraphState
-from src.models.story_employee import EmployeeStory
 from src.utils.chat_watsonx_llm import ChatLLMInstance
+from src.utils.assignment import AssignmentEngine
+from src.utils.parsed_file_cache import PARSED_FILES
+from src.utils.skill_index import SkillIndex, get_skill_index
+from src.models.capacity_matrix import CapacityMatrix
 from src.tools.determine_who import DetermineWho
 
 
@@ -12,58 +15,86 @@ class AssignStory:
         self.settings = settings
         self.logger = logger
         self.chat_llm = chat_llm
-        self.jira_utils = JiraUtils(
-            self.settings.JIRA_EMAIL, self.settings.JIRA_API_TOKEN, self.logger
-        )
+        self.jira_utils = JiraUtils.from_settings(self.settings, self.logger)
 
     def story_assignee(self, state: GraphState):
-        """Assigns stories to employees in batches of 3 and updates state accordingly."""
-
-        all_stories = list(state["stories"].values())
-        batch_size = 3
-
-        for i in range(0, len(all_stories), batch_size):
-            stories = all_stories[i : i + batch_size]  # Pick the next 3 stories
-            project_details = {
-                "project_name": state["input"].project_name,
-                "project_description": state["input"].project_desc,
-            }
-            # Get story assignment response
-            story_agent = self.get_react_agent(
-                self.get_tools(
-                    chat_llm=self.chat_llm,
-                    stories=stories,
-                    project_details=project_details,
-                    employee_bandwidth=state["employee_bandwidth"],
-                )
-            )
-            agent_prompt = """ 
-                Your task is to assign each story to the most suitable employee based on the following criteria:
-
-                1. **Skill Match** - The employee must have the required skills for the story.  
-                2. **Bandwidth Availability** - Verify that the employee has the capacity to take on the story. If they don't, identify another employee who can.  
-                3. **Unique Assignment** - Each story should be assigned to only one employee.  
-
-                To accomplish this, you have access to the following tool:  
-                - **Determine Who**  
-                Ensure that every story is assigned efficiently, considering both skill relevance and workload distribution.  
-            """
-
-            response = story_agent.invoke({"messages": [("user", agent_prompt)]})
-            response = response["structured_response"]
-            response = response.model_dump()
-            # Update state with assigned employee emails and update bandwidth
-            for story_id, emp_id in response["story_employee_mapping"].items():
-                story = state["stories"][story_id]
-                employee = state["employee_data"].get(emp_id)
-                if employee:
-                    # story.assignee = employee.email
-                    story.assignee = employee.emp_id
-                    if emp_id in state["employee_bandwidth"]:
-                        state["employee_bandwidth"][emp_id][
-                            "bandwidth"
-                        ] -= story.estimate
-                        state["employee_bandwidth"][emp_id]["story"] = story.title
+        """
+        Assigns stories to employees with the local skill-matching engine.
+        Only stories whose best match is below ASSIGNMENT_CONFIDENCE_THRESHOLD go to the LLM.
+        Bookings go to a snapshot of the capacity matrix, the sprint is planned on the original.
+        """
+        capacity = state["capacity"].snapshot()
+        skill_index = self.get_skill_index(state)
+        engine, low_confidence = self.assign_confident(state, capacity, skill_index)
+
+        assigned = set()
+        batch_size = self.settings.ASSIGNMENT_LLM_BATCH_SIZE
+        for i in range(0, len(low_confidence), batch_size):
+            stories = low_confidence[i : i + batch_size]
+            candidates = self.get_candidates(state, stories, capacity, skill_index)
+            if not candidates:
+                continue
+            tool = self.get_tool(state, stories, candidates, skill_index)
+            response = tool.invoke({})
+            assigned |= self.apply_assignments(state, response.story_employee_mapping, capacity)
+
+        unassigned = [story for story in low_confidence if story.issue_id not in assigned]
+        return self.assign_leftovers(state, engine, unassigned, capacity)
+
+    async def astory_assignee(self, state: GraphState):
+        """Async variant of story_assignee"""
+        capacity = state["capacity"].snapshot()
+        skill_index = self.get_skill_index(state)
+        engine, low_confidence = self.assign_confident(state, capacity, skill_index)
+
+        assigned = set()
+        batch_size = self.settings.ASSIGNMENT_LLM_BATCH_SIZE
+        for i in range(0, len(low_confidence), batch_size):
+            stories = low_confidence[i : i + batch_size]
+            candidates = self.get_candidates(state, stories, capacity, skill_index)
+            if not candidates:
+                continue
+            tool = self.get_tool(state, stories, candidates, skill_index)
+            response = await tool.ainvoke({})
+            assigned |= self.apply_assignments(state, response.story_employee_mapping, capacity)
+
+        unassigned = [story for story in low_confidence if story.issue_id not in assigned]
+        return self.assign_leftovers(state, engine, unassigned, capacity)
+
+    def get_skill_index(self, state: GraphState) -> SkillIndex:
+        """The run's skill index, built by the roster loader"""
+        if state.get("skill_index") is not None:
+            return state["skill_index"]
+        return get_skill_index(state["employee_data"], self.settings)
+
+    def assign_confident(
+        self, state: GraphState, capacity: CapacityMatrix, skill_index: SkillIndex
+    ):
+        # The engine only depends on the roster, it is reused while the roster file is unchanged
+        engine = PARSED_FILES.derive(
+            state["employee_data"],
+            "assignment_engine",
+            lambda employee_data: AssignmentEngine(employee_data, skill_index),
+        )
+        mapping, low_confidence = engine.assign(
+            list(state["stories"].values()),
+            self.get_remaining_bandwidth(state, capacity),
+            threshold=self.settings.ASSIGNMENT_CONFIDENCE_THRESHOLD,
+        )
+        self.apply_assignments(state, mapping, capacity)
+        self.logger.info(
+            f"Assigned {len(mapping)} stories locally, {len(low_confidence)} need the LLM"
+        )
+        return engine, low_confidence
+
+    def assign_leftovers(
+        self, state: GraphState, engine: AssignmentEngine, unassigned, capacity: CapacityMatrix
+    ):
+        """Place stories the LLM left unassigned and build the node update"""
+        if unassigned:
+            self.logger.info(f"Falling back to local assignment for {len(unassigned)} stories")
+            mapping = engine.fallback(unassigned, self.get_remaining_bandwidth(state, capacity))
+            self.apply_assignments(state, mapping, capacity)
 
         return {
             "employee_bandwidth": state["employee_bandwidth"],
@@ -71,21 +102,70 @@ class AssignStory:
             "next_node": "assign_story_jira",
         }
 
-    def get_react_agent(self, tools):
-        story_agent = create_react_agent(
-            model=self.chat_llm,
-            tools=tools,
-            debug=True,
-            response_format=EmployeeStory,
+    def get_remaining_bandwidth(self, state: GraphState, capacity: CapacityMatrix):
+        """Free days per employee over the project, read from the capacity matrix"""
+        return capacity.available_all(state["project_start_date"], state["project_end_date"])
+
+    def apply_assignments(
+        self, state: GraphState, story_employee_mapping, capacity: CapacityMatrix
+    ):
+        """Book assigned stories on the capacity matrix, return the assigned story ids"""
+        assigned = set()
+        for story_id, emp_id in story_employee_mapping.items():
+            story = state["stories"].get(story_id)
+            employee = state["employee_data"].get(emp_id)
+            if story and employee:
+                # story.assignee = employee.email
+                story.assignee = employee.emp_id
+                if emp_id in state["employee_bandwidth"]:
+                    window = (state["project_start_date"], state["project_end_date"])
+                    capacity.reserve(emp_id, story.estimate, *window)
+                    state["employee_bandwidth"][emp_id]["bandwidth"] = capacity.available(
+                        emp_id, *window
+                    )
+                    state["employee_bandwidth"][emp_id]["story"] = story.title
+                assigned.add(story_id)
+        return assigned
+
+    def get_candidates(
+        self, state: GraphState, stories, capacity: CapacityMatrix, skill_index: SkillIndex
+    ):
+        """
+        employee_bandwidth of the employees the skill index shortlists for the stories.
+        Empty when nobody has free capacity, those stories are left to the local fallback.
+        """
+        candidates = skill_index.shortlist(
+            stories,
+            self.get_remaining_bandwidth(state, capacity),
+            min_level=self.settings.ASSIGNMENT_SHORTLIST_MIN_PROFICIENCY,
+            limit=self.settings.ASSIGNMENT_SHORTLIST_SIZE,
         )
-        return story_agent
-
-    def get_tools(self, stories, project_details, chat_llm, employee_bandwidth):
-        return [
-            DetermineWho(
-                chat_llm=chat_llm,
-                employee_bandwidth=employee_bandwidth,
-                stories=stories,
-                project_details=project_details,
+        if not candidates:
+            self.logger.info(
+                f"No employee has free capacity for {len(stories)} stories, skipping the LLM"
+            )
+        else:
+            self.logger.info(
+                f"Shortlisted {len(candidates)} of {len(state['employee_data'])} employees "
+                f"for {len(stories)} stories"
             )
-        ]
+        return {
+            emp_id: state["employee_bandwidth"][emp_id]
+            for emp_id in candidates
+            if emp_id in state["employee_bandwidth"]
+        }
+
+    def get_tool(
+        self, state: GraphState, stories, employee_bandwidth: Dict[str, Dict], skill_index: SkillIndex
+    ):
+        project_details = {
+            "project_name": state["input"].project_name,
+            "project_description": state["input"].project_desc,
+        }
+        return DetermineWho(
+            chat_llm=self.chat_llm,
+            employee_bandwidth=employee_bandwidth,
+            stories=stories,
+            project_details=project_details,
+            skill_index=skill_index,
+        )
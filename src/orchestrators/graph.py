@@ -1,3 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from src.models.graph_state import GraphState
 from src.utils.chat_watsonx_llm import ChatLLMInstance
@@ -19,6 +24,10 @@ class ProjectPlannerGraph:
         self.logger = logger
         # self.app = self.create_graph()
         self.settings = settings
+        self.node_executor = ThreadPoolExecutor(
+            max_workers=self.settings.GRAPH_NODE_WORKERS,
+            thread_name_prefix="graph-node",
+        )
         self.chat_llm_manager = ChatLLMInstance(
             settings=self.settings, model_id="meta-llama/llama-3-3-70b-instruct"
         )
@@ -30,14 +39,16 @@ class ProjectPlannerGraph:
         )
         self.csv_manager = CSVProcessor(settings=self.settings, logger=self.logger)
         self.estimates_sprint_count = EstimatedSprintCount(
-            country_code="US", logger=self.logger
+            country_code="US", settings=self.settings, logger=self.logger
         )
         self.jira_node = JiraNode(settings=self.settings, logger=self.logger)
         self.assign_story = AssignStory(
             chat_llm=self.chat_llm, settings=self.settings, logger=self.logger
         )
 
-        self.order_stories = OrderStories(chat_llm=self.chat_llm, logger=self.logger)
+        self.order_stories = OrderStories(
+            chat_llm=self.chat_llm, logger=self.logger, settings=self.settings
+        )
 
         self.plan_next_sprint = PlanNextSprint(
             settings=self.settings, logger=self.logger
@@ -52,27 +63,50 @@ class ProjectPlannerGraph:
 
         ## Add nodes and edges
         self.workflow.add_node(
-            "estimate_sprint_count", self.estimates_sprint_count.calculate_sprint_days
+            "estimate_sprint_count",
+            self.as_node(self.estimates_sprint_count.calculate_sprint_days),
         )
         self.workflow.add_node(
-            "epic_and_stories", self.epic_and_stories.identify_epics_stories
+            "epic_and_stories",
+            self.as_node(
+                self.epic_and_stories.identify_epics_stories,
+                self.epic_and_stories.aidentify_epics_stories,
+            ),
         )
         self.workflow.add_node("data_manager", self.csv_manager.data_manager)
-        self.workflow.add_node("load_input_data", self.csv_manager.process_csv)
         self.workflow.add_node(
-            "load_employee_data", self.csv_manager.read_employee_data
+            "load_input_data", self.as_node(self.csv_manager.process_csv)
+        )
+        self.workflow.add_node(
+            "load_employee_data", self.as_node(self.csv_manager.read_employee_data)
+        )
+        self.workflow.add_node(
+            "create_jira_issues",
+            self.as_node(self.jira_node.create_jira_issues, self.jira_node.acreate_jira_issues),
+        )
+        self.workflow.add_node(
+            "story_assignee",
+            self.as_node(
+                self.assign_story.story_assignee, self.assign_story.astory_assignee
+            ),
+        )
+        self.workflow.add_node(
+            "assign_story_jira",
+            self.as_node(self.jira_node.assign_story_jira, self.jira_node.aassign_story_jira),
+        )
+        self.workflow.add_node(
+            "order_stories",
+            self.as_node(
+                self.order_stories.order_stories, self.order_stories.aorder_stories
+            ),
         )
-        self.workflow.add_node("create_jira_issues", self.jira_node.create_jira_issues)
-        self.workflow.add_node("story_assignee", self.assign_story.story_assignee)
-        self.workflow.add_node("assign_story_jira", self.jira_node.assign_story_jira)
-        self.workflow.add_node("order_stories", self.order_stories.order_stories)
         self.workflow.add_node(
             "employee_bandwidth_for_sprint",
-            self.estimates_sprint_count.employee_bandwidth_for_next_sprint,
+            self.as_node(self.estimates_sprint_count.employee_bandwidth_for_next_sprint),
         )
 
         self.workflow.add_node(
-            "plan_next_sprint", self.plan_next_sprint.plan_next_sprint
+            "plan_next_sprint", self.as_node(self.plan_next_sprint.plan_next_sprint)
         )
 
         self.workflow.add_node(
@@ -82,7 +116,10 @@ class ProjectPlannerGraph:
 
         self.workflow.add_node("agent_manager", self.supervisor.agent_manager)
 
-        self.workflow.add_node("create_and_update_sprint", self.jira_node.create_sprint)
+        self.workflow.add_node(
+            "create_and_update_sprint",
+            self.as_node(self.jira_node.create_sprint, self.jira_node.acreate_sprint),
+        )
 
         self.workflow.add_edge("load_input_data", "data_manager")
         self.workflow.add_edge("load_employee_data", "data_manager")
@@ -102,6 +139,28 @@ class ProjectPlannerGraph:
         app = self.workflow.compile()
         return app
 
+    def as_node(self, func, afunc=None):
+        """
+        Wrap a node so it can run under both invoke and ainvoke.
+        Nodes without an async variant are offloaded to the bounded node executor
+        so they never block the event loop.
+        """
+        if afunc is None:
+
+            async def afunc(state: GraphState):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.node_executor, partial(copy_context().run, func, state)
+                )
+
+        return RunnableLambda(func, afunc=afunc, name=func.__name__)
+
+    def shutdown(self):
+        """Release the node executor and Jira sessions"""
+        self.node_executor.shutdown(wait=False, cancel_futures=True)
+        self.jira_node.close()
+        self.assign_story.jira_utils.close()
+
     # def should_end(self, state: GraphState):
     #     if "next_node" in state and (state["next_node"] == "__end__" or state["next_node"] is END):
     #         return END
@@ -1,17 +1,26 @@
 """Router """
 
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import HTMLResponse, StreamingResponse
 from src.models.project_planner_request import ProjectPlannerRequest
 
 from src.services.project_planner import ProjectPlannerService
+from src.services.planning_jobs import PlanningJobService
+from src.services.input_files import InputFileService, InputFileTooLarge
 
 
 class AppInvoke:
     """Agent LLM Router"""
 
-    def __init__(self, service: ProjectPlannerService) -> None:
+    def __init__(
+        self,
+        service: ProjectPlannerService,
+        job_service: PlanningJobService,
+        input_service: InputFileService,
+    ) -> None:
         self.service = service
+        self.job_service = job_service
+        self.input_service = input_service
         self.router = APIRouter()
 
         self.router.add_api_route(
@@ -27,15 +36,84 @@ class AppInvoke:
             summary="get graph",
             response_class=HTMLResponse,
         )
+        self.router.add_api_route(
+            path="/jobs",
+            methods=["Post"],
+            endpoint=self.submit_job,
+            summary="Start a planning job",
+            status_code=202,
+        )
+        self.router.add_api_route(
+            path="/jobs/{run_id}",
+            methods=["Get"],
+            endpoint=self.get_job,
+            summary="Get planning job status and final state",
+        )
+        self.router.add_api_route(
+            path="/jobs/{run_id}/events",
+            methods=["Get"],
+            endpoint=self.stream_job,
+            summary="Stream planning job progress",
+        )
+        self.router.add_api_route(
+            path="/inputs/{kind}",
+            methods=["Post"],
+            endpoint=self.upload_input,
+            summary="Upload a task or roster file (csv, parquet or arrow) as the raw request body",
+            status_code=201,
+        )
 
     async def invoke(self, request: ProjectPlannerRequest):
         """invoke"""
         # response = await self.service.invoke(request=request)
         # return response["response"]
 
+        self.check_inputs(request)
         return await self.service.invoke(request=request)
 
     async def get_graph(self):
         """get graph"""
 
         return self.service.get_graph()
+
+    async def submit_job(self, request: ProjectPlannerRequest):
+        """submit job"""
+        self.check_inputs(request)
+        job = self.job_service.submit(request=request)
+        return {"run_id": job.run_id, "status": job.status}
+
+    async def get_job(self, run_id: str):
+        """get job"""
+        job = self.job_service.get(run_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Unknown run id {run_id}")
+        return job
+
+    async def stream_job(self, run_id: str):
+        """stream job"""
+        if self.job_service.get(run_id) is None:
+            raise HTTPException(status_code=404, detail=f"Unknown run id {run_id}")
+        return StreamingResponse(
+            self.job_service.events(run_id), media_type="text/event-stream"
+        )
+
+    async def upload_input(self, kind: str, request: Request, format: str = "csv"):
+        """upload input"""
+        content_length = request.headers.get("content-length")
+        try:
+            return await self.input_service.save_stream(
+                kind,
+                request.stream(),
+                int(content_length) if content_length else None,
+                format,
+            )
+        except InputFileTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    def check_inputs(self, request: ProjectPlannerRequest):
+        try:
+            self.input_service.check_request(request)
+        except (ValueError, FileNotFoundError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
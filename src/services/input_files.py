@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from src.models.input_file import InputFile
+from src.models.project_planner_request import ProjectPlannerRequest
+from src.settings.app_settings import AppSettings
+from src.utils.ingestion import DataIngestion
+from src.utils.parsed_file_cache import PARSED_FILES
+
+INPUT_KINDS = ("tasks", "roster")
+UPLOAD_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+class InputFileTooLarge(ValueError):
+    pass
+
+
+class InputFileService:
+    """
+    Stores uploaded task and roster files for later planning requests.
+
+    Bodies are spooled to INPUT_UPLOAD_DIR chunk by chunk as they arrive, so an upload
+    is never held in memory, and are stored under their SHA-256: the same file uploaded
+    twice is stored once and stays a hit in the parsed file cache.
+
+    After each upload, stored files not uploaded again within INPUT_UPLOAD_RETENTION_SECONDS
+    are deleted, as are the oldest ones beyond INPUT_UPLOAD_MAX_FILES.
+    """
+
+    def __init__(self, settings: AppSettings, logger):
+        self.settings = settings
+        self.logger = logger
+        self.ingestion = DataIngestion(settings, logger)
+
+    async def save_stream(
+        self,
+        kind: str,
+        chunks: AsyncIterator[bytes],
+        content_length: Optional[int] = None,
+        file_format: str = "csv",
+    ) -> InputFile:
+        """Write a streamed body to the upload directory, up to INPUT_MAX_UPLOAD_BYTES"""
+        if kind not in INPUT_KINDS:
+            raise ValueError(f"Unknown input kind {kind}, expected one of {INPUT_KINDS}")
+        if file_format not in UPLOAD_EXTENSIONS:
+            raise ValueError(
+                f"Unknown input format {file_format}, expected one of {list(UPLOAD_EXTENSIONS)}"
+            )
+        limit = self.settings.INPUT_MAX_UPLOAD_BYTES
+        if content_length is not None and content_length > limit:
+            raise InputFileTooLarge(f"Upload of {content_length} bytes exceeds {limit} bytes")
+
+        os.makedirs(self.settings.INPUT_UPLOAD_DIR, exist_ok=True)
+        temp_path = os.path.join(self.settings.INPUT_UPLOAD_DIR, f"{uuid4().hex}.part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as upload_file:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > limit:
+                        raise InputFileTooLarge(f"Upload exceeds {limit} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(upload_file.write, chunk)
+
+            extension = UPLOAD_EXTENSIONS[file_format]
+            path = os.path.join(
+                self.settings.INPUT_UPLOAD_DIR, f"{kind}-{digest.hexdigest()}{extension}"
+            )
+            if os.path.exists(path):
+                # Same content as a stored upload: keep that file, and its cache entry, fresh
+                os.utime(path)
+            else:
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.logger.info(f"Stored {size} byte {kind} upload as {path}")
+        await asyncio.to_thread(self.cleanup, keep=path)
+        return InputFile(kind=kind, path=path, size=size, sha256=digest.hexdigest())
+
+    def cleanup(self, keep: Optional[str] = None) -> int:
+        """Delete expired and surplus stored uploads, returns how many were deleted"""
+        upload_dir = self.settings.INPUT_UPLOAD_DIR
+        if not os.path.isdir(upload_dir):
+            return 0
+
+        uploads = []
+        for name in os.listdir(upload_dir):
+            path = os.path.join(upload_dir, name)
+            if name.endswith(".part") or path == keep or not os.path.isfile(path):
+                continue
+            uploads.append((os.path.getmtime(path), path))
+        uploads.sort(reverse=True)
+
+        expires = time.time() - self.settings.INPUT_UPLOAD_RETENTION_SECONDS
+        # keep counts towards the limit
+        limit = max(0, self.settings.INPUT_UPLOAD_MAX_FILES - (keep is not None))
+        expired = [
+            path for i, (mtime, path) in enumerate(uploads) if mtime < expires or i >= limit
+        ]
+        for path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        if expired:
+            self.logger.info(f"Deleted {len(expired)} stored uploads from {upload_dir}")
+            PARSED_FILES.prune()
+        return len(expired)
+
+    def check_request(self, request: ProjectPlannerRequest):
+        """Fail fast on input paths a planning run would reject"""
+        for path in (request.csv_path, request.roster_path):
+            if path:
+                self.ingestion.resolve_path(path)
@@ -0,0 +1,114 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from typing import Dict
+from uuid import uuid4
+
+from src.models.planning_job import JobProgress, JobStatus, PlanningJob
+from src.models.project_planner_request import ProjectPlannerRequest
+from src.services.project_planner import ProjectPlannerService
+from src.settings.app_settings import AppSettings
+
+TERMINAL_STATUSES = (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class PlanningJobService:
+    """Runs planning graphs in the background and tracks their progress"""
+
+    def __init__(self, service: ProjectPlannerService, settings: AppSettings, logger):
+        self.service = service
+        self.settings = settings
+        self.logger = logger
+        self.jobs: Dict[str, PlanningJob] = {}
+        self.conditions: Dict[str, asyncio.Condition] = {}
+        self.workers = asyncio.Semaphore(self.settings.PLANNING_JOB_WORKERS)
+        self.tasks = set()
+
+    def submit(self, request: ProjectPlannerRequest) -> PlanningJob:
+        """Queue a planning run and return its job straight away"""
+        self.evict_expired()
+
+        job = PlanningJob(
+            run_id=uuid4().hex, status=JobStatus.PENDING, created_at=datetime.now()
+        )
+        self.jobs[job.run_id] = job
+        self.conditions[job.run_id] = asyncio.Condition()
+
+        task = asyncio.create_task(self.run(job, request))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        self.logger.info(f"Queued planning job {job.run_id}")
+        return job
+
+    def get(self, run_id: str) -> PlanningJob:
+        return self.jobs.get(run_id)
+
+    async def run(self, job: PlanningJob, request: ProjectPlannerRequest):
+        async with self.workers:
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now()
+            await self.notify(job)
+            try:
+                async for mode, chunk in self.service.astream(request):
+                    if mode == "values":
+                        job.result = chunk
+                        continue
+                    for node, update in chunk.items():
+                        next_node = (
+                            update.get("next_node") if isinstance(update, dict) else None
+                        )
+                        job.progress.append(
+                            JobProgress(
+                                node=node, next_node=next_node, timestamp=datetime.now()
+                            )
+                        )
+                        self.logger.info(f"Planning job {job.run_id} finished {node}")
+                    await self.notify(job)
+                job.status = JobStatus.SUCCEEDED
+            except Exception as e:
+                self.logger.error(f"Planning job {job.run_id} failed: {e}")
+                job.status = JobStatus.FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = datetime.now()
+                await self.notify(job)
+
+    async def notify(self, job: PlanningJob):
+        condition = self.conditions[job.run_id]
+        async with condition:
+            condition.notify_all()
+
+    async def events(self, run_id: str):
+        """Server-Sent-Events stream of node progress, ending with the final status"""
+        job = self.jobs[run_id]
+        condition = self.conditions[run_id]
+        sent = 0
+
+        while True:
+            async with condition:
+                await condition.wait_for(
+                    lambda: len(job.progress) > sent or job.status in TERMINAL_STATUSES
+                )
+            for progress in job.progress[sent:]:
+                yield self.format_event("progress", progress.model_dump_json())
+            sent = len(job.progress)
+
+            if job.status in TERMINAL_STATUSES:
+                status = {"run_id": job.run_id, "status": job.status, "error": job.error}
+                yield self.format_event("status", json.dumps(status))
+                return
+
+    def format_event(self, event: str, data: str) -> str:
+        return f"event: {event}\ndata: {data}\n\n"
+
+    def evict_expired(self):
+        """Forget finished jobs older than PLANNING_JOB_TTL_SECONDS"""
+        cutoff = datetime.now() - timedelta(seconds=self.settings.PLANNING_JOB_TTL_SECONDS)
+        expired = [
+            run_id
+            for run_id, job in self.jobs.items()
+            if job.status in TERMINAL_STATUSES and job.finished_at < cutoff
+        ]
+        for run_id in expired:
+            del self.jobs[run_id]
+            del self.conditions[run_id]
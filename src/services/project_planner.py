@@ -17,9 +17,16 @@ class ProjectPlannerService:
         )
 
     async def invoke(self, request: ProjectPlannerRequest):
-        result = self.graph_app.invoke(input = {"input": request})
+        result = await self.graph_app.ainvoke(input={"input": request})
         return result
 
+    async def astream(self, request: ProjectPlannerRequest):
+        """Yield (mode, chunk) pairs: per-node "updates" and the running "values" state"""
+        async for mode, chunk in self.graph_app.astream(
+            input={"input": request}, stream_mode=["updates", "values"]
+        ):
+            yield mode, chunk
+
     def get_graph(self):
         image_stream = self.graph_app.get_graph(xray=True).draw_mermaid_png()
 
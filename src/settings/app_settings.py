@@ -19,3 +19,52 @@ class AppSettings(BaseSettings):
     JIRA_API_TOKEN: str
     CSV_PATH: str = Field(default="src/config/task_subtask_list.csv")
     EMPLOYEE_DATA: str = Field(default="src/config/team_data.csv")
+    INPUT_CACHE_ENABLED: bool = Field(default=True)
+    INPUT_CACHE_MAX_FILES: int = Field(default=16)
+    INPUT_CHUNK_ROWS: int = Field(default=50000)
+    INPUT_UPLOAD_DIR: str = Field(default=".cache/uploads")
+    INPUT_MAX_UPLOAD_BYTES: int = Field(default=200 * 1024 * 1024)
+    INPUT_UPLOAD_RETENTION_SECONDS: int = Field(default=7 * 24 * 3600)
+    INPUT_UPLOAD_MAX_FILES: int = Field(default=200)
+    GRAPH_NODE_WORKERS: int = Field(default=8)
+    PLANNING_JOB_WORKERS: int = Field(default=4)
+    PLANNING_JOB_TTL_SECONDS: int = Field(default=3600)
+    STORY_CHAIN_CONCURRENCY: int = Field(default=5)
+    LLM_CACHE_ENABLED: bool = Field(default=True)
+    LLM_CACHE_PATH: str = Field(default=".cache/llm_cache.sqlite")
+    LLM_CACHE_TTL_SECONDS: int = Field(default=7 * 24 * 3600)
+    LLM_CACHE_MAX_ENTRIES: int = Field(default=10000)
+    LLM_CACHE_MAX_BYTES: int = Field(default=256 * 1024 * 1024)
+    ASSIGNMENT_CONFIDENCE_THRESHOLD: float = Field(default=0.5)
+    ASSIGNMENT_LLM_BATCH_SIZE: int = Field(default=10)
+    ASSIGNMENT_SHORTLIST_SIZE: int = Field(default=20)
+    ASSIGNMENT_SHORTLIST_MIN_PROFICIENCY: str = Field(default="Beginner")
+    SKILL_ALIASES_PATH: str = Field(default="src/config/skill_aliases.csv")
+    PROMPT_DESCRIPTION_CHARS: int = Field(default=200)
+    PROMPT_STORY_TOKEN_BUDGET: int = Field(default=6000)
+    SPRINT_LENGTH_DAYS: int = Field(default=14)
+    HOLIDAY_PROVIDER: str = Field(default="nager")
+    HOLIDAY_RULES_PATH: str = Field(default="src/config/holiday_rules.csv")
+    HOLIDAY_CACHE_PATH: str = Field(default=".cache/holidays.json")
+    HOLIDAY_CACHE_TTL_SECONDS: int = Field(default=7 * 24 * 3600)
+    HOLIDAY_API_TIMEOUT: float = Field(default=5.0)
+    LEAVE_TRACE: bool = Field(default=False)
+    JIRA_SITE_URL: str = Field(default="https://ashwathyashwathy761.atlassian.net")
+    JIRA_POOL_SIZE: int = Field(default=10)
+    JIRA_CONNECT_TIMEOUT: float = Field(default=5.0)
+    JIRA_READ_TIMEOUT: float = Field(default=30.0)
+    JIRA_BULK_CREATE: bool = Field(default=True)
+    JIRA_RECONCILE: bool = Field(default=True)
+    JIRA_ACCOUNT_CACHE_PATH: str = Field(default=".cache/jira_accounts.json")
+    JIRA_ACCOUNT_CACHE_TTL_SECONDS: int = Field(default=24 * 3600)
+    JIRA_RATE_LIMIT: float = Field(default=10.0)
+    JIRA_RATE_BURST: int = Field(default=20)
+    JIRA_MAX_RETRIES: int = Field(default=5)
+    JIRA_BACKOFF_BASE: float = Field(default=0.5)
+    JIRA_BACKOFF_MAX: float = Field(default=30.0)
+    JIRA_MAX_IN_FLIGHT: int = Field(default=10)
+    JIRA_OUTBOX_ENABLED: bool = Field(default=False)
+    JIRA_OUTBOX_PATH: str = Field(default=".cache/jira_outbox.sqlite")
+    JIRA_OUTBOX_BATCH_SIZE: int = Field(default=50)
+    JIRA_OUTBOX_MAX_ATTEMPTS: int = Field(default=5)
+    JIRA_OUTBOX_WAIT_TIMEOUT: float = Field(default=300.0)
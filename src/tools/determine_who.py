@@ -8,13 +8,15 @@ from langchain.tools import BaseTool
 from src.settings.app_settings import AppSettings
 from langchain_core.prompts import PromptTemplate
 from src.models.story_employee import EmployeeStory
+from src.utils.prompt_encoding import LEVEL_LEGEND, PromptEncoder
 
 PROMPT_TEMPLATE = PromptTemplate.from_template(
-    "You are given a list of stories: {stories}, along with project details: {project_details}. Additionally, you have employee bandwidth data: {employee_bandwidth}, which includes each employee’s skills and availability "
+    "You are given a table of stories:\n{stories}\nalong with project details: {project_details}. Additionally, you have a table of employees:\n{employee_bandwidth}\nwith each employee’s free days and skills (levels: {levels}) "
     "Your task is to assign each story to the most suitable employee based on their skills. "
     "Each story should be assigned only once.Employees may have multiple skills, but prioritize matching the required skill for each story "
     "Distribute stories as evenly as possible while ensuring skill alignment."
-    "If stories are related or dependent on each other, assign them to the same employee whenever feasible"
+    "If stories are related or dependent on each other, assign them to the same employee whenever feasible. "
+    "Answer with the story ids (S1, S2, ...) and employee ids (E1, E2, ...) from the tables"
 )
 
 class DetermineWho(BaseTool):
@@ -28,18 +30,55 @@ class DetermineWho(BaseTool):
     employee_bandwidth:Dict[str, Dict]
     stories: List[Story]
     project_details: Dict[str, Any]
+    skill_index: Any = None
 
     settings: ClassVar = AppSettings()
     logger: ClassVar = logging.getLogger(__name__)
 
-    def _run(self) -> List[Dict[str, str]]:
+    def _run(self) -> EmployeeStory:
         """Synchronously assigns employees to stories based on skills."""
-        assignee_chain = PROMPT_TEMPLATE | self.chat_llm.with_structured_output(EmployeeStory)
-        story_employee_mapping = assignee_chain.invoke(
-            input={
-                "stories": self.stories, 
-                "employee_bandwidth": self.employee_bandwidth,
-                "project_details": self.project_details
-            }
+        encoder = self.get_encoder()
+        story_employee_mapping = self.get_chain().invoke(input=self.get_input(encoder))
+        return self.decode(encoder, story_employee_mapping)
+
+    async def _arun(self) -> EmployeeStory:
+        """Asynchronously assigns employees to stories based on skills."""
+        encoder = self.get_encoder()
+        story_employee_mapping = await self.get_chain().ainvoke(input=self.get_input(encoder))
+        return self.decode(encoder, story_employee_mapping)
+
+    def get_chain(self):
+        return PROMPT_TEMPLATE | self.chat_llm.with_structured_output(EmployeeStory)
+
+    def get_encoder(self) -> PromptEncoder:
+        return PromptEncoder(
+            self.settings.PROMPT_DESCRIPTION_CHARS,
+            self.settings.PROMPT_STORY_TOKEN_BUDGET,
+            self.logger,
         )
-        return story_employee_mapping
\ No newline at end of file
+
+    def get_input(self, encoder: PromptEncoder):
+        # Only the skills these stories mention are listed, all of them if none is known
+        skills = None
+        if self.skill_index is not None:
+            skills = set().union(*(self.skill_index.story_skills(story) for story in self.stories)) or None
+        prompt_input = {
+            "stories": encoder.encode_stories(self.stories, ("epic", "title", "estimate")),
+            "employee_bandwidth": encoder.encode_employees(
+                self.employee_bandwidth, self.skill_index, skills
+            ),
+            "project_details": encoder.shorten(
+                f"{self.project_details.get('project_name', '')}: "
+                f"{self.project_details.get('project_description', '')}"
+            ),
+            "levels": LEVEL_LEGEND,
+        }
+        encoder.log_size("Determine who", prompt_input)
+        return prompt_input
+
+    def decode(self, encoder: PromptEncoder, response: EmployeeStory) -> EmployeeStory:
+        """Maps the story and employee ids of the answer back to issue and employee ids"""
+        return EmployeeStory(
+            story_employee_mapping=encoder.decode_mapping(response.story_employee_mapping)
+        )
+
@@ -0,0 +1,129 @@
+"""Parquet, Arrow IPC and CSV input tables read through pyarrow, imported only when needed"""
+
+import csv
+from typing import Dict, Iterator, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet as pq
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+CSV_EXTENSIONS = (".csv",)
+# pyarrow's defaults lack two of the values pandas.read_csv reads as missing
+CSV_NULL_VALUES = pyarrow.csv.ConvertOptions().null_values + ["<NA>", "None"]
+
+
+class ArrowTableReader:
+    """
+    Reads only the requested columns of a Parquet or Arrow IPC (Feather v2) file through
+    a memory map, batch_rows rows at a time.
+
+    Skills and leaves may be stored natively as list<struct<name, value>> columns, e.g.
+    list<struct<skill_name: string, proficiency: string>> and
+    list<struct<ocassion: string, date: date32>>. Those are flattened straight from the
+    Arrow buffers into (row labels, first values, second values) arrays; string columns
+    are left in the frame for the CSV text parser.
+
+    CSV exports, with their title line above the header, are read as string columns by
+    the multithreaded pyarrow CSV reader, which is several times faster than pandas.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str], batch_rows: int):
+        self.path = path
+        self.columns = list(columns)
+        self.batch_rows = batch_rows
+
+    def batches(self) -> Iterator[pa.RecordBatch]:
+        if self.path.lower().endswith(CSV_EXTENSIONS):
+            yield from self.csv_batches()
+            return
+
+        if self.path.lower().endswith(PARQUET_EXTENSIONS):
+            parquet_file = pq.ParquetFile(self.path, memory_map=True)
+            names = parquet_file.schema_arrow.names
+            yield from parquet_file.iter_batches(
+                batch_size=self.batch_rows,
+                columns=[column for column in self.columns if column in names],
+            )
+            return
+
+        with pa.memory_map(self.path) as source:
+            reader = pa.ipc.open_file(source)
+            names = reader.schema.names
+            columns = [column for column in self.columns if column in names]
+            for index in range(reader.num_record_batches):
+                batch = reader.get_batch(index).select(columns)
+                for offset in range(0, batch.num_rows, self.batch_rows):
+                    yield batch.slice(offset, self.batch_rows)
+
+    def csv_batches(self) -> Iterator[pa.RecordBatch]:
+        """
+        The requested columns present in a CSV export, regrouped from the reader's
+        blocks into batches of batch_rows rows
+        """
+        with open(self.path, newline="") as csv_file:
+            reader = csv.reader(csv_file)
+            next(reader, None)
+            names = next(reader, [])
+        columns = [column for column in self.columns if column in names]
+        if not columns:
+            return
+
+        reader = pyarrow.csv.open_csv(
+            self.path,
+            read_options=pyarrow.csv.ReadOptions(skip_rows=1),
+            convert_options=pyarrow.csv.ConvertOptions(
+                include_columns=columns,
+                column_types={column: pa.string() for column in columns},
+                null_values=CSV_NULL_VALUES,
+                strings_can_be_null=True,
+            ),
+        )
+        pending, rows = [], 0
+        for batch in reader:
+            pending.append(batch)
+            rows += batch.num_rows
+            if rows >= self.batch_rows:
+                table = pa.Table.from_batches(pending)
+                for offset in range(0, rows - rows % self.batch_rows, self.batch_rows):
+                    yield table.slice(offset, self.batch_rows).combine_chunks().to_batches()[0]
+                pending = table.slice(rows - rows % self.batch_rows).to_batches()
+                rows = rows % self.batch_rows
+        if rows:
+            yield pa.Table.from_batches(pending).combine_chunks().to_batches()[0]
+
+    def chunks(self) -> Iterator[Tuple[pd.DataFrame, Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]]]]:
+        """(frame of the flat columns, flattened pairs of the list columns) per batch"""
+        start = 0
+        for batch in self.batches():
+            labels = np.arange(start, start + batch.num_rows)
+            list_columns = [
+                field.name
+                for field in batch.schema
+                if pa.types.is_list(field.type) or pa.types.is_large_list(field.type)
+            ]
+            df = batch.select(
+                [name for name in batch.schema.names if name not in list_columns]
+            ).to_pandas()
+            df.index = pd.RangeIndex(start, start + batch.num_rows)
+            pairs = {
+                name: self.flatten_pairs(batch.column(name), labels) for name in list_columns
+            }
+            start += batch.num_rows
+            yield df, pairs
+
+    def flatten_pairs(
+        self, column: pa.Array, labels: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Row labels and the first and second struct fields of every list item"""
+        rows = labels[pc.list_parent_indices(column).to_numpy()]
+        values = pc.list_flatten(column)
+        return (
+            rows,
+            values.field(0).to_numpy(zero_copy_only=False),
+            values.field(1).to_numpy(zero_copy_only=False),
+        )
@@ -0,0 +1,128 @@
+"""Local skill-matching assignment engine"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.employee import Employee
+from src.models.skill import ProficiencyLevel
+from src.models.story import Story
+from src.utils.skill_index import SkillIndex
+
+PROFICIENCY_WEIGHTS = {
+    ProficiencyLevel.BEGINNER: 1 / 3,
+    ProficiencyLevel.INTERMEDIATE: 2 / 3,
+    ProficiencyLevel.EXPERT: 1.0,
+}
+
+
+class AssignmentEngine:
+    """
+    Scores every story against every employee in one pass and assigns stories
+    greedily, in their dependency order, to the best-scoring employee with capacity.
+
+    A story's score for an employee is the sum over the employee's skills of
+    (fraction of the skill's words found in the story text) x (proficiency weight).
+    """
+
+    def __init__(self, employee_data: Dict[str, Employee], skill_index: SkillIndex = None):
+        self.emp_ids = list(employee_data.keys())
+        # Skill names and story text are normalized the same way (case, plurals, aliases)
+        self.skill_index = skill_index or SkillIndex(employee_data)
+        skill_names = sorted(self.skill_index.skills)
+        skill_tokens = [name.split() for name in skill_names]
+        self.vocabulary = {
+            token: i
+            for i, token in enumerate(sorted({t for tokens in skill_tokens for t in tokens}))
+        }
+
+        # skills x vocabulary incidence, normalised so a fully matched skill sums to 1
+        self.skill_tokens = np.zeros((len(skill_names), len(self.vocabulary)))
+        for row, tokens in enumerate(skill_tokens):
+            for token in tokens:
+                self.skill_tokens[row, self.vocabulary[token]] = 1 / len(tokens)
+
+        # skills x employees proficiency weights
+        skill_rows = {name: i for i, name in enumerate(skill_names)}
+        self.skill_weights = np.zeros((len(skill_names), len(self.emp_ids)))
+        for col, emp_id in enumerate(self.emp_ids):
+            for name, level in self.skill_index.employee_skills[emp_id].items():
+                self.skill_weights[skill_rows[name], col] = PROFICIENCY_WEIGHTS[level]
+
+    def tokenize(self, text: str) -> List[str]:
+        return self.skill_index.tokenize(text).split()
+
+    def score(self, stories: List[Story]) -> np.ndarray:
+        """stories x employees score matrix"""
+        story_tokens = np.zeros((len(stories), len(self.vocabulary)))
+        for row, story in enumerate(stories):
+            for token in self.tokenize(f"{story.epic} {story.title} {story.description}"):
+                col = self.vocabulary.get(token)
+                if col is not None:
+                    story_tokens[row, col] = 1
+
+        coverage = story_tokens @ self.skill_tokens.T
+        return coverage @ self.skill_weights
+
+    def assign(
+        self,
+        stories: List[Story],
+        bandwidth: Dict[str, float],
+        threshold: float,
+        overbook: bool = False,
+    ) -> Tuple[Dict[str, str], List[Story]]:
+        """
+        Assign confident stories within the remaining bandwidth.
+
+        :param bandwidth: remaining bandwidth per emp_id
+        :param threshold: minimum best score for a story to be assigned locally
+        :param overbook: give a story nobody has room for to the best scorer anyway
+        :return: ({issue_id: emp_id}, stories left for the LLM, including those that fit nobody)
+        """
+        if not self.emp_ids:
+            return {}, list(stories)
+
+        scores = self.score(stories)
+        remaining = np.array(
+            [bandwidth.get(emp_id, 0) for emp_id in self.emp_ids], dtype=float
+        )
+
+        mapping = {}
+        low_confidence = []
+        for row, story in enumerate(stories):
+            if scores[row].max() < threshold:
+                low_confidence.append(story)
+                continue
+            col = self.pick(scores[row], remaining, story.estimate, overbook)
+            if col is None:
+                low_confidence.append(story)
+                continue
+            remaining[col] -= story.estimate
+            mapping[story.issue_id] = self.emp_ids[col]
+
+        return mapping, low_confidence
+
+    def fallback(
+        self, stories: List[Story], bandwidth: Dict[str, float]
+    ) -> Dict[str, str]:
+        """
+        Assign stories the LLM could not place, regardless of confidence. A story nobody
+        has room for is overbooked on its best scorer rather than left unassigned.
+        """
+        mapping, _ = self.assign(stories, bandwidth, threshold=-1, overbook=True)
+        return mapping
+
+    def pick(
+        self, scores: np.ndarray, remaining: np.ndarray, estimate: int, overbook: bool = False
+    ) -> Optional[int]:
+        """
+        Best score among employees that fit, ties broken by most free capacity.
+        None when nobody fits, unless overbook, which then picks among everyone.
+        """
+        fits = remaining >= estimate
+        if not fits.any():
+            if not overbook:
+                return None
+            fits = np.ones_like(fits)
+        order = np.lexsort((-remaining, -np.where(fits, scores, -np.inf)))
+        return int(order[0])
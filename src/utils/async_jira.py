@@ -0,0 +1,358 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiohttp
+
+from src.models.epic import Epic
+from src.models.sprint import Sprint
+from src.models.story import Story
+from src.utils.jira import (
+    BULK_CREATE_LIMIT,
+    POST_RETRY_STATUSES,
+    RETRY_STATUSES,
+    SPRINT_MOVE_LIMIT,
+    JiraUtils,
+)
+from src.utils.rate_limit import backoff_delay, parse_retry_after
+
+
+@dataclass
+class AsyncResponse:
+    """The parts of a response JiraUtils' parsers need, read before the connection is released"""
+
+    status_code: int
+    text: str
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncJiraUtils:
+    """
+    aiohttp counterpart of JiraUtils for the per-story fan-out phases.
+
+    Payload builders, response parsing, the account cache, rate limiter and metrics
+    are shared with the wrapped JiraUtils. At most max_in_flight requests are open at
+    once, and per-item logs are written in input order once a phase completes.
+    """
+
+    def __init__(self, jira_utils: JiraUtils, max_in_flight: int = 10):
+        self.jira_utils = jira_utils
+        self.logger = jira_utils.logger
+        self.max_in_flight = max_in_flight
+
+    def session(self) -> aiohttp.ClientSession:
+        connect_timeout, read_timeout = self.jira_utils.timeout
+        return aiohttp.ClientSession(
+            headers=self.jira_utils.headers,
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+        )
+
+    async def request(
+        self, session: aiohttp.ClientSession, method: str, url: str, **kwargs
+    ) -> AsyncResponse:
+        """Async JiraUtils.request: same rate limit, retry and metrics rules, non-blocking waits"""
+        jira = self.jira_utils
+        endpoint = jira.get_endpoint(method, url)
+        retry_statuses = POST_RETRY_STATUSES if method == "POST" else RETRY_STATUSES
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            await jira.rate_limiter.aacquire()
+            with jira.stats_lock:
+                jira.requests_sent += 1
+            try:
+                async with session.request(method, url, **kwargs) as raw_response:
+                    response = AsyncResponse(raw_response.status, await raw_response.text())
+                    retry_after = raw_response.headers.get("Retry-After")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= jira.max_retries:
+                    jira.metrics.record(endpoint, time.monotonic() - started, attempt, True)
+                    raise
+                delay = backoff_delay(attempt, jira.backoff_base, jira.backoff_max)
+                self.logger.warning(
+                    f"{endpoint} failed ({e!r}), retry {attempt + 1}/{jira.max_retries} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in retry_statuses or attempt >= jira.max_retries:
+                if response.status_code < 400:
+                    jira.rate_limiter.reward()
+                jira.metrics.record(
+                    endpoint, time.monotonic() - started, attempt, response.status_code >= 400
+                )
+                return response
+
+            delay = backoff_delay(
+                attempt, jira.backoff_base, jira.backoff_max, parse_retry_after(retry_after)
+            )
+            self.logger.warning(
+                f"{endpoint} returned {response.status_code}, retry {attempt + 1}/{jira.max_retries} in {delay:.2f}s"
+            )
+            if response.status_code == 429:
+                jira.rate_limiter.throttle(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def create_issue(self, session: aiohttp.ClientSession, fields: Dict) -> Optional[str]:
+        response = await self.request(
+            session, "POST", self.jira_utils.JIRA_BASE_URL, json={"fields": fields}
+        )
+        if response.status_code == 201:
+            return response.json()["key"]
+        self.logger.info(f"Failed to create issue: {fields['summary']} -> {response.text}")
+        return None
+
+    async def bulk_create_issues(
+        self, session: aiohttp.ClientSession, issues: List[Dict]
+    ) -> List[Optional[str]]:
+        """JiraUtils.bulk_create_issues with the chunks sent concurrently"""
+
+        async def create_chunk(chunk):
+            payload = {"issueUpdates": [{"fields": fields} for fields in chunk]}
+            response = await self.request(
+                session, "POST", f"{self.jira_utils.JIRA_BASE_URL}/bulk", json=payload
+            )
+            return self.jira_utils.parse_bulk_response(response, chunk)
+
+        chunks = [
+            issues[i : i + BULK_CREATE_LIMIT] for i in range(0, len(issues), BULK_CREATE_LIMIT)
+        ]
+        results = await asyncio.gather(*(create_chunk(chunk) for chunk in chunks))
+        return [key for chunk_keys in results for key in chunk_keys]
+
+    async def update_issue(self, session: aiohttp.ClientSession, issue_key: str, fields: Dict) -> bool:
+        payload = {
+            "fields": {
+                name: value
+                for name, value in fields.items()
+                if name in ("summary", "description", "labels", "parent")
+            }
+        }
+        response = await self.request(
+            session, "PUT", f"{self.jira_utils.JIRA_BASE_URL}/{issue_key}", json=payload
+        )
+        if response.status_code == 204:
+            return True
+        self.logger.info(f"Failed to update {issue_key}: {response.text}")
+        return False
+
+    async def sync_issues(
+        self,
+        session: aiohttp.ClientSession,
+        issues: List[Dict],
+        existing: Dict[str, Dict[str, str]],
+        bulk: bool,
+    ) -> List[Optional[str]]:
+        """JiraUtils.sync_issues with updates and creations sent concurrently"""
+        keys, updates = self.jira_utils.diff_issues(issues, existing)
+        updated = asyncio.gather(
+            *(self.update_issue(session, issue_key, fields) for issue_key, fields in updates)
+        )
+
+        missing = [index for index, key in enumerate(keys) if not key]
+        if bulk and missing:
+            created = await self.bulk_create_issues(session, [issues[index] for index in missing])
+            for index, key in zip(missing, created):
+                keys[index] = key
+
+        retries = [index for index in missing if not keys[index]]
+        retried = await asyncio.gather(
+            *(self.create_issue(session, issues[index]) for index in retries)
+        )
+        for index, key in zip(retries, retried):
+            keys[index] = key
+        await updated
+
+        for issue_key, fields in updates:
+            self.logger.info(f"Issue Updated: {fields['summary']} -> {issue_key}")
+        self.logger.info(
+            f"Synced {len(issues)} issues: {len(missing)} created, {len(updates)} updated, "
+            f"{len(issues) - len(missing) - len(updates)} unchanged"
+        )
+        return keys
+
+    async def process_epics_and_tasks(
+        self,
+        epics: List[Epic],
+        stories: List[Story],
+        bulk: bool = True,
+        reconcile: bool = True,
+        scope: str = "",
+    ) -> Dict[str, Story]:
+        """Async JiraUtils.process_epics_and_tasks: stories under created epics are created concurrently"""
+        jira = self.jira_utils
+        existing = await asyncio.to_thread(jira.search_synced_issues) if reconcile else {}
+
+        async with self.session() as session:
+            epic_keys = await self.sync_issues(
+                session, jira.get_epics_fields(epics, scope), existing, bulk
+            )
+
+            epic_mapping = {}  # To store {epic_title: epic_key}
+            for epic, epic_key in zip(epics, epic_keys):
+                if epic_key:
+                    self.logger.info(f"Epic: {epic.title} -> {epic_key}")
+                    epic_mapping[epic.title.lower()] = epic_key
+                    epic.epic_id = epic_key
+
+            for story in stories:
+                if story.epic.lower() not in epic_mapping:
+                    message = f"Skipping Story: {story.title} (No matching epic found)"
+                    self.logger.error(message)
+                    raise RuntimeError(message)
+
+            task_keys = await self.sync_issues(
+                session, jira.get_stories_fields(stories, epic_mapping, scope), existing, bulk
+            )
+
+        stories_dict = {}
+        for story, task_key in zip(stories, task_keys):
+            if not task_key:
+                self.logger.error(f"Failed to create task for {story.title}.")
+                raise Exception(f"Failed to create task for {story.title}.")
+            self.logger.info(
+                f"Task: {story.title} -> {task_key} (Linked to {epic_mapping[story.epic.lower()]})"
+            )
+            story.issue_id = task_key
+            stories_dict[story.issue_id] = story
+
+        self.logger.info("Processed epics and tasks, updated stories and epics.")
+        return stories_dict
+
+    async def get_account_id(self, session: aiohttp.ClientSession, email: str) -> Optional[str]:
+        """Async JiraUtils.get_account_id, through the session so it counts as a request in flight"""
+        jira = self.jira_utils
+        account_id = jira.account_cache.get(email)
+        if account_id:
+            return account_id
+
+        response = await self.request(
+            session, "GET", f"{jira.JIRA_SITE_URL}/rest/api/3/user/search", params={"query": email}
+        )
+        if response.status_code == 200 and response.json():
+            account_id = response.json()[0]["accountId"]
+            jira.account_cache.set(email, account_id)
+            return account_id
+
+        self.logger.info(f"Failed to retrieve account ID for {email}: {response.text}")
+        return None
+
+    async def get_account_ids(
+        self, session: aiohttp.ClientSession, emails: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """Account IDs by lower-cased email, each distinct email is looked up once"""
+        distinct = list(dict.fromkeys(email.lower() for email in emails if email))
+        account_ids = await asyncio.gather(
+            *(self.get_account_id(session, email) for email in distinct)
+        )
+        return dict(zip(distinct, account_ids))
+
+    async def assign_story(
+        self, session: aiohttp.ClientSession, story: Story, account_id: Optional[str]
+    ) -> bool:
+        """Async JiraUtils.assign_story with the assignee's account ID already resolved"""
+        jira = self.jira_utils
+        for attempt in range(2):
+            if not account_id:
+                return False
+
+            response = await self.request(
+                session,
+                "PUT",
+                f"{jira.JIRA_BASE_URL}/{story.issue_id}/assignee",
+                json={"accountId": account_id},
+            )
+            if response.status_code == 204:
+                return True
+            if response.status_code == 404 and attempt == 0:
+                # The cached account may be gone, look it up again once
+                jira.account_cache.invalidate(story.assignee)
+                account_id = await self.get_account_id(session, story.assignee)
+                continue
+
+            self.logger.info(f"Failed to assign {story.issue_id}: {response.text}")
+            return False
+        return False
+
+    async def assign_stories(self, stories: List[Story]) -> List[bool]:
+        """
+        Assign stories concurrently, stories carry the assignee email. Emails missing from
+        the account cache are resolved once each before the assignments fan out.
+        """
+        async with self.session() as session:
+            account_ids = await self.get_account_ids(
+                session, [story.assignee for story in stories]
+            )
+            results = await asyncio.gather(
+                *(
+                    self.assign_story(
+                        session, story, account_ids.get((story.assignee or "").lower())
+                    )
+                    for story in stories
+                )
+            )
+        for story, assigned in zip(stories, results):
+            if assigned:
+                self.logger.info(f"Successfully assigned {story.title} to {story.assignee}")
+        return results
+
+    async def assign_stories_to_sprint(self, sprint: Sprint) -> Dict[str, bool]:
+        """Async JiraUtils.assign_stories_to_sprint, with the chunks moved concurrently"""
+        jira = self.jira_utils
+        issue_ids = [story.issue_id for story in sprint.stories.values()]
+        if not sprint.id:
+            self.logger.error("Sprint ID is missing. Cannot assign stories.")
+            return {issue_id: False for issue_id in issue_ids}
+
+        move_url = f"{jira.JIRA_SITE_URL}/rest/agile/1.0/sprint/{sprint.id}/issue"
+
+        async def move_chunk(session, chunk):
+            response = await self.request(session, "POST", move_url, json={"issues": chunk})
+            if response.status_code == 204:
+                return dict.fromkeys(chunk, True)
+            self.logger.error(
+                f"Failed to move {len(chunk)} stories to Sprint {sprint.id}, retrying one by one. Response: {response.text}"
+            )
+            moved = await asyncio.gather(
+                *(move_issue(session, issue_id) for issue_id in chunk)
+            )
+            return dict(zip(chunk, moved))
+
+        async def move_issue(session, issue_id):
+            response = await self.request(
+                session,
+                "PUT",
+                f"{jira.JIRA_SITE_URL}/rest/api/2/issue/{issue_id}",
+                json={"fields": {"customfield_10020": sprint.id}},
+            )
+            return response.status_code == 204
+
+        async with self.session() as session:
+            results = await asyncio.gather(
+                *(
+                    move_chunk(session, issue_ids[i : i + SPRINT_MOVE_LIMIT])
+                    for i in range(0, len(issue_ids), SPRINT_MOVE_LIMIT)
+                )
+            )
+
+        status = {}
+        for chunk_status in results:
+            status.update(chunk_status)
+        for issue_id, moved in status.items():
+            if moved:
+                self.logger.info(f"Story {issue_id} assigned to Sprint {sprint.id}")
+            else:
+                self.logger.error(f"Failed to assign Story {issue_id} to Sprint {sprint.id}")
+        self.logger.info(
+            f"{sum(status.values())}/{len(status)} stories assigned to Sprint {sprint.id}"
+        )
+        return status
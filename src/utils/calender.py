@@ -1,15 +1,72 @@
+import logging
+import threading
 import requests
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+from src.settings.app_settings import AppSettings
+from src.utils.holiday_cache import HolidayCache
+from src.utils.holiday_rules import RuleBasedHolidayUtils
+
+
 class PublicHolidayUtils:
-    def __init__(self, country_code: str):
+    def __init__(
+        self,
+        country_code: str,
+        cache: HolidayCache = None,
+        timeout: float = 5.0,
+        logger=None,
+        fallback: RuleBasedHolidayUtils = None,
+    ):
         """
         Initializes the Public Holiday utility using Nager.Date API.
         :param country_code: Country code for fetching public holidays (e.g., 'US', 'IN')
+        :param cache: (country, year) holiday cache, in memory only when not given
+        :param timeout: seconds to wait for the API
+        :param fallback: offline provider for years neither cached nor reachable
         """
         self.country_code = country_code
         self.base_url = "https://date.nager.at/api/v3/PublicHolidays"
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache = cache or HolidayCache(
+            path=None, ttl_seconds=7 * 24 * 3600, logger=self.logger
+        )
+        self.timeout = timeout
+        self.fallback = fallback
+        self.refreshing = set()
+        self.refresh_lock = threading.Lock()
+        self.refresh_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="holiday-refresh"
+        )
+
+    @classmethod
+    def from_settings(cls, country_code: str, settings: AppSettings, logger):
+        """
+        The holiday provider selected by HOLIDAY_PROVIDER: "rules" computes holidays offline
+        from HOLIDAY_RULES_PATH, "nager" uses the API with the rules as a fallback when available.
+        """
+        try:
+            rules = RuleBasedHolidayUtils(country_code, settings.HOLIDAY_RULES_PATH, logger)
+        except (OSError, ValueError) as e:
+            if settings.HOLIDAY_PROVIDER == "rules":
+                raise
+            logger.warning(f"No offline holiday fallback for {country_code}: {e}")
+            rules = None
+        if settings.HOLIDAY_PROVIDER == "rules":
+            return rules
+
+        return cls(
+            country_code,
+            cache=HolidayCache(
+                path=settings.HOLIDAY_CACHE_PATH,
+                ttl_seconds=settings.HOLIDAY_CACHE_TTL_SECONDS,
+                logger=logger,
+            ),
+            timeout=settings.HOLIDAY_API_TIMEOUT,
+            logger=logger,
+            fallback=rules,
+        )
 
     def get_public_holidays(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
         """
@@ -18,22 +75,64 @@ class PublicHolidayUtils:
         :param end_date: End date for fetching holidays
         :return: List of public holiday dates
         """
-        # ---
-        year = start_date.year  # Fetch holidays for the year in which end_date falls
-        url = f"{self.base_url}/{year}/{self.country_code}"
+        holiday_dates = []
+        # Ranges can cross into the next year(s), cover every year they touch
+        for year in range(start_date.year, end_date.year + 1):
+            holiday_dates.extend(self.get_year_holidays(year))
+
+        # Filter holidays that fall within the given range
+        filtered_holidays = [date for date in holiday_dates if start_date <= date <= end_date]
+        self.logger.debug(f"Holidays: {filtered_holidays}")
+        return filtered_holidays
 
-        print(f"Fetching public holidays from: {url}") 
+    def get_year_holidays(self, year: int) -> List[datetime.date]:
+        """
+        Holidays of one year, from the cache when it has been seen before.
+        Stale years are served as they are and refreshed in the background.
+        """
+        cached = self.cache.get(self.country_code, year)
+        if cached is None:
+            try:
+                return self.fetch_year_holidays(year)
+            except Exception as e:
+                if self.fallback is None:
+                    raise
+                self.logger.warning(
+                    f"Using offline {self.country_code} holidays for {year}, API failed: {e}"
+                )
+                return sorted(self.fallback.get_year_holidays(year))
 
-        response = requests.get(url)
-        print(f"Response Status Code: {response.status_code}")  
-        print(f"Response Text: {response.text}") 
+        holiday_dates, fresh = cached
+        if not fresh:
+            self.schedule_refresh(year)
+        return holiday_dates
+
+    def fetch_year_holidays(self, year: int) -> List[datetime.date]:
+        url = f"{self.base_url}/{year}/{self.country_code}"
+        self.logger.info(f"Fetching public holidays from: {url}")
+
+        response = requests.get(url, timeout=self.timeout)
         if response.status_code != 200:
             raise Exception(f"Failed to fetch holidays: {response.text}")
 
         holidays = response.json()
         holiday_dates = [datetime.datetime.strptime(holiday["date"], "%Y-%m-%d").date() for holiday in holidays]
+        self.cache.set(self.country_code, year, holiday_dates)
+        return holiday_dates
 
-        # Filter holidays that fall within the given range
-        filtered_holidays = [date for date in holiday_dates if start_date <= date <= end_date]
-        print(f"Holidays: {filtered_holidays}")
-        return filtered_holidays
\ No newline at end of file
+    def schedule_refresh(self, year: int):
+        with self.refresh_lock:
+            if year in self.refreshing:
+                return
+            self.refreshing.add(year)
+        self.refresh_executor.submit(self.refresh_year, year)
+
+    def refresh_year(self, year: int):
+        try:
+            self.fetch_year_holidays(year)
+        except Exception as e:
+            # The stale dates stay in use until the API answers again
+            self.logger.warning(f"Could not refresh {self.country_code} holidays for {year}: {e}")
+        finally:
+            with self.refresh_lock:
+                self.refreshing.discard(year)
@@ -3,6 +3,7 @@
 import os
 from langchain_ibm import ChatWatsonx
 from src.settings.app_settings import AppSettings
+from src.utils.llm_cache import LLMResponseCache
 
 
 class ChatLLMInstance:
@@ -18,6 +19,7 @@ class ChatLLMInstance:
             "max_new_tokens": 250,
             "stop_sequences": ["\nObservation", "\n\n"],
         }
+        self.cache = None
 
     def get_llm(self):
         """Get LLM"""
@@ -27,6 +29,20 @@ class ChatLLMInstance:
             model_id=self.model_id,
             url=self.settings.WATSONX_API_ENDPOINT,
             project_id=self.settings.WATSONX_PROJECT_ID,
+            cache=self.get_cache(),
         )
 
         return llm
+
+    def get_cache(self):
+        """Response cache shared by every LLM handed out by this instance"""
+        if not self.settings.LLM_CACHE_ENABLED:
+            return None
+        if self.cache is None:
+            self.cache = LLMResponseCache(
+                path=self.settings.LLM_CACHE_PATH,
+                ttl_seconds=self.settings.LLM_CACHE_TTL_SECONDS,
+                max_entries=self.settings.LLM_CACHE_MAX_ENTRIES,
+                max_bytes=self.settings.LLM_CACHE_MAX_BYTES,
+            )
+        return self.cache
@@ -0,0 +1,258 @@
+"""In-process stand-in for the Jira Cloud endpoints JiraUtils uses, for load and regression testing"""
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+ISSUE_PATH = re.compile(r"^/rest/api/[23]/issue/(?P<key>[A-Z][A-Z0-9]*-\d+)$")
+ASSIGNEE_PATH = re.compile(r"^/rest/api/3/issue/(?P<key>[A-Z][A-Z0-9]*-\d+)/assignee$")
+SPRINT_ISSUE_PATH = re.compile(r"^/rest/agile/1.0/sprint/(?P<id>\d+)/issue$")
+
+
+class FakeJira:
+    """
+    Serves issue create (single and bulk), issue update, assignee, user search,
+    JQL search, agile sprint and sprint-issue endpoints from memory on a local port.
+
+    Every response is delayed by latency seconds (+/- jitter). A throttle_rate share of
+    requests gets a 429 with Retry-After and an error_rate share a 502/503/504, before
+    the request is applied, like Jira does.
+
+        with FakeJira(latency=0.05, throttle_rate=0.02) as jira:
+            client = JiraUtils(email, token, logger, site_url=jira.url)
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        users: Optional[List[str]] = None,
+        hide_emails: bool = False,
+        project_key: str = "AI1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ):
+        """
+        :param users: emails known to Jira, None resolves any email
+        :param hide_emails: leave emailAddress out of user listings, like sites whose
+            users keep their email private
+        :param port: 0 picks a free port
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.hide_emails = hide_emails
+        self.users = None if users is None else {email.lower() for email in users}
+        self.project_key = project_key
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.issue_numbers = itertools.count(1)
+        self.sprint_ids = itertools.count(1)
+        self.issues: Dict[str, Dict] = {}
+        self.sprints: Dict[int, Dict] = {}
+        self.requests: Dict[str, int] = {}
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.get_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self) -> "FakeJira":
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="fake-jira", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeJira":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment, avoiding delayed-ACK stalls on keep-alive
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                fake.handle(self, "GET")
+
+            def do_POST(self):
+                fake.handle(self, "POST")
+
+            def do_PUT(self):
+                fake.handle(self, "PUT")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        url = urlsplit(handler.path)
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = json.loads(handler.rfile.read(length) or b"null")
+        with self.lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            roll = self.random.random()
+
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.throttle_rate:
+            status, payload = 429, {"errorMessages": ["Rate limit exceeded"]}
+            headers = {"Retry-After": f"{self.retry_after:g}"}
+        elif roll < self.throttle_rate + self.error_rate:
+            status, payload = self.random.choice([502, 503, 504]), None
+            headers = {}
+        else:
+            status, payload = self.route(method, url.path, parse_qs(url.query), body)
+            headers = {}
+
+        data = b"" if payload is None else json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def route(self, method: str, path: str, query: Dict[str, List[str]], body):
+        """(status, JSON payload) for an accepted request"""
+        if method == "POST" and path == "/rest/api/3/issue":
+            return 201, self.create_issue(body["fields"])
+        if method == "POST" and path == "/rest/api/3/issue/bulk":
+            return 201, {
+                "issues": [self.create_issue(item["fields"]) for item in body["issueUpdates"]],
+                "errors": [],
+            }
+        if method == "POST" and path == "/rest/api/3/search/jql":
+            return 200, self.search(body)
+        if method == "GET" and path == "/rest/api/3/user/search":
+            return 200, self.find_users(query.get("query", [""])[0])
+        if method == "GET" and path == "/rest/api/3/users/search":
+            start_at = int(query.get("startAt", ["0"])[0])
+            max_results = int(query.get("maxResults", ["50"])[0])
+            users = self.find_users(None)[start_at : start_at + max_results]
+            if self.hide_emails:
+                users = [
+                    {key: value for key, value in user.items() if key != "emailAddress"}
+                    for user in users
+                ]
+            return 200, users
+        if method == "POST" and path == "/rest/agile/1.0/sprint":
+            return 201, self.create_sprint(body)
+
+        match = ASSIGNEE_PATH.match(path)
+        if method == "PUT" and match:
+            return self.assign_issue(match["key"], body.get("accountId"))
+        match = ISSUE_PATH.match(path)
+        if method == "PUT" and match:
+            return self.update_issue(match["key"], body.get("fields", {}))
+        match = SPRINT_ISSUE_PATH.match(path)
+        if method == "POST" and match:
+            return self.move_to_sprint(int(match["id"]), body["issues"])
+
+        return 404, {"errorMessages": [f"No fake for {method} {path}"]}
+
+    def create_issue(self, fields: Dict) -> Dict:
+        with self.lock:
+            number = next(self.issue_numbers)
+            key = f"{self.project_key}-{number}"
+            self.issues[key] = dict(fields)
+        return {
+            "id": str(10000 + number),
+            "key": key,
+            "self": f"{self.url}/rest/api/3/issue/{key}",
+        }
+
+    def update_issue(self, key: str, fields: Dict):
+        with self.lock:
+            issue = self.issues.get(key)
+            if issue is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            if "customfield_10020" in fields:
+                sprint = self.sprints.get(fields.pop("customfield_10020"))
+                if sprint is None:
+                    return 400, {"errors": {"customfield_10020": "Sprint does not exist"}}
+                sprint["issues"].add(key)
+            issue.update(fields)
+        return 204, None
+
+    def assign_issue(self, key: str, account_id: Optional[str]):
+        with self.lock:
+            issue = self.issues.get(key)
+            if issue is None:
+                return 404, {"errorMessages": ["Issue does not exist"]}
+            issue["assignee"] = account_id
+        return 204, None
+
+    def search(self, body: Dict) -> Dict:
+        """Supports the `labels = "..."` clause JiraUtils sends, paged by nextPageToken"""
+        label = re.search(r'labels = "([^"]+)"', body.get("jql", ""))
+        with self.lock:
+            matches = [
+                {"key": key, "fields": {"labels": fields.get("labels", [])}}
+                for key, fields in self.issues.items()
+                if label is None or label[1] in fields.get("labels", [])
+            ]
+        start = int(body.get("nextPageToken") or 0)
+        end = start + body.get("maxResults", 50)
+        page = {"issues": matches[start:end], "isLast": end >= len(matches)}
+        if end < len(matches):
+            page["nextPageToken"] = str(end)
+        return page
+
+    def find_users(self, query: Optional[str]) -> List[Dict]:
+        if self.users is None:
+            emails = [query] if query and "@" in query else []
+        else:
+            emails = sorted(
+                email for email in self.users if not query or query.lower() in email
+            )
+        return [
+            {"accountId": f"fake-{email.lower()}", "emailAddress": email, "active": True}
+            for email in emails
+        ]
+
+    def create_sprint(self, body: Dict) -> Dict:
+        with self.lock:
+            sprint_id = next(self.sprint_ids)
+            self.sprints[sprint_id] = {**body, "issues": set()}
+        return {"id": sprint_id, "name": body.get("name"), "state": "future"}
+
+    def move_to_sprint(self, sprint_id: int, keys: List[str]):
+        with self.lock:
+            sprint = self.sprints.get(sprint_id)
+            if sprint is None:
+                return 404, {"errorMessages": ["Sprint does not exist"]}
+            unknown = [key for key in keys if key not in self.issues]
+            if unknown:
+                return 400, {"errorMessages": [f"Issues do not exist: {', '.join(unknown)}"]}
+            sprint["issues"].update(keys)
+        return 204, None
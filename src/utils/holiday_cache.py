@@ -0,0 +1,58 @@
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class HolidayCache:
+    """(country, year) -> public holiday dates, kept in memory and optionally persisted to a JSON file"""
+
+    def __init__(self, path: Optional[str], ttl_seconds: int, logger=None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = self.load()
+
+    def load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable holiday cache {self.path}: {e}")
+            return {}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.entries, cache_file)
+        os.replace(temp_path, self.path)
+
+    def get_key(self, country_code: str, year: int) -> str:
+        return f"{country_code.upper()}:{year}"
+
+    def get(self, country_code: str, year: int) -> Optional[Tuple[List[datetime.date], bool]]:
+        """(holiday dates, whether they are still fresh), None if the year was never fetched"""
+        entry = self.entries.get(self.get_key(country_code, year))
+        if entry is None:
+            return None
+        dates = [datetime.date.fromisoformat(day) for day in entry["dates"]]
+        return dates, time.time() - entry["fetched_at"] <= self.ttl_seconds
+
+    def set(self, country_code: str, year: int, dates: List[datetime.date]):
+        with self.lock:
+            self.entries[self.get_key(country_code, year)] = {
+                "dates": sorted(day.isoformat() for day in dates),
+                "fetched_at": time.time(),
+            }
+            self.save()
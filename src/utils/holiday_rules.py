@@ -0,0 +1,122 @@
+"""Offline public holidays computed from the bundled rules table"""
+
+import csv
+import datetime
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Set
+
+DEFAULT_RULES_PATH = "src/config/holiday_rules.csv"
+
+
+def easter_sunday(year: int) -> datetime.date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    n = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * n) // 451
+    month, day = divmod(h + n - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, weekday: int, nth: int) -> datetime.date:
+    """nth (1-based, -1 for last) weekday (0 = Monday) of a month"""
+    if nth > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(
+            days=(weekday - first.weekday()) % 7 + 7 * (nth - 1)
+        )
+    next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+    last = next_month - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7 + 7 * (-nth - 1))
+
+
+class RuleBasedHolidayUtils:
+    """
+    Drop-in for PublicHolidayUtils that needs no network.
+
+    Rules are fixed dates, nth weekdays of a month or offsets from Easter Sunday, with
+    optional weekend observance: nearest_weekday (Saturday -> Friday, Sunday -> Monday)
+    or substitute (next weekday that is not already a holiday). Each year is computed
+    once into a frozenset, so is_holiday is a set lookup.
+    """
+
+    def __init__(self, country_code: str, rules_path: str = DEFAULT_RULES_PATH, logger=None):
+        self.country_code = country_code.upper()
+        self.logger = logger or logging.getLogger(__name__)
+        self.rules = self.load_rules(rules_path).get(self.country_code)
+        if not self.rules:
+            raise ValueError(f"No holiday rules for {self.country_code} in {rules_path}")
+        self.years: Dict[int, FrozenSet[datetime.date]] = {}
+        self.lock = threading.Lock()
+
+    def load_rules(self, rules_path: str) -> Dict[str, List[Dict]]:
+        rules = defaultdict(list)
+        with open(rules_path, encoding="utf-8", newline="") as rules_file:
+            for row in csv.DictReader(rules_file):
+                rules[row["country"].upper()].append(row)
+        return rules
+
+    def get_public_holidays(
+        self, start_date: datetime.date, end_date: datetime.date
+    ) -> List[datetime.date]:
+        """Public holidays between the given start and end dates, in date order"""
+        holiday_dates = []
+        for year in range(start_date.year, end_date.year + 1):
+            holiday_dates.extend(
+                day for day in self.get_year_holidays(year) if start_date <= day <= end_date
+            )
+        return sorted(holiday_dates)
+
+    def get_year_holidays(self, year: int) -> FrozenSet[datetime.date]:
+        holidays = self.years.get(year)
+        if holidays is None:
+            holidays = self.compute_year(year)
+            with self.lock:
+                self.years[year] = holidays
+        return holidays
+
+    def is_holiday(self, day: datetime.date) -> bool:
+        return day in self.get_year_holidays(day.year)
+
+    def compute_year(self, year: int) -> FrozenSet[datetime.date]:
+        # A Saturday New Year's Day of the next year is observed on this year's December 31
+        holidays = self.apply_rules(year) | self.apply_rules(year + 1)
+        return frozenset(day for day in holidays if day.year == year)
+
+    def apply_rules(self, year: int) -> Set[datetime.date]:
+        """Actual and observed dates of one year's holidays"""
+        easter = easter_sunday(year)
+        actual = []
+        for rule in self.rules:
+            if rule["rule"] == "fixed":
+                day = datetime.date(year, int(rule["month"]), int(rule["day"]))
+            elif rule["rule"] == "nth_weekday":
+                day = nth_weekday(
+                    year, int(rule["month"]), int(rule["weekday"]), int(rule["nth"])
+                )
+            elif rule["rule"] == "easter":
+                day = easter + datetime.timedelta(days=int(rule["offset"]))
+            else:
+                raise ValueError(f"Unknown holiday rule {rule['rule']} for {rule['name']}")
+            actual.append((day, rule.get("observed") or ""))
+
+        holidays = {day for day, _ in actual}
+        for day, observed in sorted(actual):
+            if day.weekday() < 5 or not observed:
+                continue
+            if observed == "nearest_weekday":
+                # Saturday is observed on Friday, Sunday on Monday
+                holidays.add(day + datetime.timedelta(days=-1 if day.weekday() == 5 else 1))
+            elif observed == "substitute":
+                substitute = day
+                while substitute.weekday() >= 5 or substitute in holidays:
+                    substitute += datetime.timedelta(days=1)
+                holidays.add(substitute)
+        return holidays
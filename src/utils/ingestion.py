@@ -0,0 +1,405 @@
+"""Vectorized parsing of the task and roster tables into the planner models"""
+
+import logging
+import os
+from typing import Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+from src.models.employee import Employee
+from src.models.epic import Epic
+from src.models.ingestion_report import IngestionReport
+from src.models.leave import Leave
+from src.models.skill import ProficiencyLevel, Skill
+from src.models.task import Task
+from src.utils.parsed_file_cache import PARSED_FILES
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    # Optional: CSV inputs are then read and split by pandas and Python alone
+    pa = pc = None
+
+# Joins the cells of a column, so a whole column is split into pairs by one split
+ROW_SEPARATOR = "\x1f"
+# Characters allowed between pairs, anything else is reported as stray text
+PAIR_SEPARATORS = ' \t\r\n,"'
+PROFICIENCY_LEVELS = {level.value: level for level in ProficiencyLevel}
+TASK_COLUMNS = ("Task", "Sub-task")
+EMPLOYEE_COLUMNS = ("Employee id", "name", "Email id", "Skills", "Leave plan")
+INPUT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "arrow",
+    ".pq": "arrow",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# Row labels, first and second values of the [first, second] pairs of a column
+Pairs = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class DataIngestion:
+    """
+    Parses whole input tables at once: a column of "[first, second]" pairs is joined and
+    split at every "]", and only its distinct pieces are parsed in Python. Dates and
+    proficiency levels are converted per distinct value, and the models are constructed
+    in bulk. Identical skills and leaves share one model instance, so only the distinct
+    pairs are constructed.
+
+    Parquet and Arrow inputs, chosen by file extension, are read by ArrowTableReader and
+    may hold skills and leaves as native list<struct> columns, which skip the text parsing.
+    When pyarrow is installed, CSV inputs are read by it as well and the joined columns
+    are split and deduplicated in Arrow compute kernels.
+
+    Malformed cells are skipped and collected in an IngestionReport that is logged once.
+    With INPUT_CACHE_ENABLED, parsed files are shared process-wide until their content
+    changes, for at most INPUT_CACHE_MAX_FILES files.
+    """
+
+    def __init__(self, settings, logger=None):
+        self.settings = settings
+        self.logger = logger or logging.getLogger(__name__)
+        self.cache = PARSED_FILES if settings.INPUT_CACHE_ENABLED else None
+        if self.cache:
+            self.cache.max_entries = settings.INPUT_CACHE_MAX_FILES
+
+    def read_chunks(self, path: str, columns) -> Iterator[Tuple[pd.DataFrame, Dict[str, Pairs]]]:
+        """
+        The given columns of an input file, INPUT_CHUNK_ROWS rows at a time, so a large
+        file is never held in memory as a whole frame. Each chunk comes with the pairs of
+        its native list columns, CSV chunks have none.
+        """
+        extension = os.path.splitext(path)[1].lower()
+        input_format = INPUT_FORMATS.get(extension)
+        if input_format is None:
+            raise ValueError(f"Unsupported input file {path}, expected one of {list(INPUT_FORMATS)}")
+
+        if input_format == "arrow" or pa is not None:
+            try:
+                from src.utils.arrow_reader import ArrowTableReader
+            except ImportError as e:
+                raise ImportError(f"Reading {extension} inputs needs pyarrow: {e}") from e
+            yield from ArrowTableReader(path, columns, self.settings.INPUT_CHUNK_ROWS).chunks()
+            return
+
+        # The CSV exports have a title line above the header
+        with pd.read_csv(
+            path,
+            header=1,
+            usecols=lambda column: column in columns,
+            chunksize=self.settings.INPUT_CHUNK_ROWS,
+        ) as reader:
+            for df in reader:
+                yield df, {}
+
+    def resolve_path(self, path: str) -> str:
+        """
+        The real path of an input file, which must be in the directory of a configured
+        input or in INPUT_UPLOAD_DIR.
+        """
+        allowed = {
+            os.path.realpath(os.path.dirname(self.settings.CSV_PATH) or "."),
+            os.path.realpath(os.path.dirname(self.settings.EMPLOYEE_DATA) or "."),
+            os.path.realpath(self.settings.INPUT_UPLOAD_DIR),
+        }
+        real_path = os.path.realpath(path)
+        if os.path.dirname(real_path) not in allowed:
+            raise ValueError(f"Input file {path} is outside the input directories")
+        if not os.path.isfile(real_path):
+            raise FileNotFoundError(f"Input file {path} does not exist")
+        return real_path
+
+    def load_tasks(self, path: str) -> Tuple[Dict[str, Task], List[Epic]]:
+        """Tasks by area and a new empty epic per area, the epics are filled in per request"""
+        task_dict = self.load(path, "tasks", TASK_COLUMNS, self.parse_tasks)
+        epic_list = [
+            Epic(epic_id="", title=task, description="", stories=[]) for task in task_dict
+        ]
+        return task_dict, epic_list
+
+    def load_employees(self, path: str) -> Dict[str, Employee]:
+        return self.load(path, "employees", EMPLOYEE_COLUMNS, self.parse_employees)
+
+    def load(
+        self,
+        path: str,
+        kind: str,
+        columns,
+        parse: Callable[[pd.DataFrame, Dict[str, Pairs], IngestionReport, Dict], int],
+    ) -> Dict:
+        """
+        Parse a file chunk by chunk into one dict, through the cache when it is enabled.
+        parse adds a chunk to the dict and returns the number of rows it loaded.
+        """
+
+        def parse_file(file_path: str) -> Dict:
+            parsed = {}
+            report = IngestionReport(source=file_path)
+            for df, pairs in self.read_chunks(file_path, columns):
+                report.rows += len(df)
+                report.loaded += parse(df, pairs, report, parsed)
+            self.log_report(report)
+            return parsed
+
+        if self.cache is None:
+            return parse_file(path)
+        return self.cache.get(path, kind, parse_file)
+
+    def parse_tasks(
+        self, df: pd.DataFrame, pairs: Dict[str, Pairs], report: IngestionReport, task_dict: Dict[str, Task]
+    ) -> int:
+        """Add the sub-tasks of a chunk to task_dict, grouped by task in file order"""
+        df = self.drop_missing(df, ("Task", "Sub-task"), report)
+        for task, items in df.groupby("Task", sort=False)["Sub-task"].agg(list).items():
+            if task in task_dict:
+                task_dict[task].subtask.extend(items)
+            else:
+                task_dict[task] = Task.model_construct(area=task, subtask=items)
+        return len(df)
+
+    def parse_employees(
+        self,
+        df: pd.DataFrame,
+        pairs: Dict[str, Pairs],
+        report: IngestionReport,
+        employees: Dict[str, Employee],
+    ) -> int:
+        """Add the employees of a chunk to employees, the last row wins when an id repeats"""
+        df = self.drop_missing(df, ("Employee id", "name", "Email id"), report)
+        emp_ids = df["Employee id"].astype(str)
+        repeated = emp_ids.duplicated(keep="last")
+        report.add(
+            df.index[repeated] + 1,
+            "Employee id",
+            emp_ids[repeated],
+            "duplicate employee id, a later row replaces it",
+        )
+        replacing = emp_ids[~repeated].isin(employees.keys())
+        report.add(
+            df.index[~repeated][replacing] + 1,
+            "Employee id",
+            emp_ids[~repeated][replacing],
+            "duplicate employee id, replaces an earlier row",
+        )
+        df, emp_ids = df[~repeated], emp_ids[~repeated]
+        known = len(employees)
+
+        skills = self.parse_skills(df.index, self.get_pairs(df, pairs, "Skills", report), report)
+        leaves = self.parse_leaves(
+            df.index, self.get_pairs(df, pairs, "Leave plan", report), report
+        )
+        # Every value is parsed and checked above and the leaves are in date order
+        emp_ids = emp_ids.tolist()
+        employees.update(
+            zip(
+                emp_ids,
+                self.construct_many(
+                    Employee,
+                    emp_id=emp_ids,
+                    name=df["name"].astype(str).tolist(),
+                    email=df["Email id"].astype(str).tolist(),
+                    skills=skills,
+                    leave_plans=leaves,
+                ),
+            )
+        )
+        # Rows replacing an employee of an earlier chunk add no employee
+        return len(employees) - known
+
+    def drop_missing(self, df: pd.DataFrame, columns, report: IngestionReport) -> pd.DataFrame:
+        """Report and drop the rows with an empty required column"""
+        for column in columns:
+            missing = df[column].isna()
+            report.add(df.index[missing] + 1, column, df[column][missing], f"missing {column}")
+            df = df[~missing]
+        return df
+
+    def get_pairs(
+        self, df: pd.DataFrame, pairs: Dict[str, Pairs], column: str, report: IngestionReport
+    ) -> Pairs:
+        """The pairs of a column, from its native list column or parsed from its text"""
+        if column in pairs:
+            rows, first, second = pairs[column]
+            missing = pd.isna(first) | pd.isna(second)
+            report.add(rows[missing] + 1, column, second[missing], "pair with an empty value")
+            return rows[~missing], first[~missing], second[~missing]
+        return self.extract_pairs(df[column], report)
+
+    def parse_skills(self, index: pd.Index, pairs: Pairs, report: IngestionReport) -> List[List[Skill]]:
+        """Skills of every row of index, unknown proficiency levels are skipped"""
+        rows, names, levels = pairs
+        level_codes, level_names = pd.factorize(levels)
+        proficiencies = np.array(
+            [PROFICIENCY_LEVELS.get(level) for level in level_names], dtype=object
+        )
+        invalid = np.equal(proficiencies[level_codes], None)
+        report.add(
+            rows[invalid] + 1,
+            "Skills",
+            levels[invalid],
+            f"proficiency is not one of {list(PROFICIENCY_LEVELS)}",
+        )
+        name_codes, skill_names = pd.factorize(names[~invalid])
+        skills = self.construct_shared(
+            Skill,
+            skill_name=(name_codes, skill_names),
+            proficiency=(level_codes[~invalid], proficiencies),
+        )
+        return self.split_by_row(index, rows[~invalid], skills)
+
+    def parse_leaves(self, index: pd.Index, pairs: Pairs, report: IngestionReport) -> List[List[Leave]]:
+        """Leaves of every row of index in date order, invalid dates are skipped"""
+        rows, occasions, dates = pairs
+        if np.issubdtype(dates.dtype, np.datetime64):
+            # Native date columns need no parsing
+            date_codes, day_numbers = pd.factorize(
+                dates.astype("datetime64[D]"), use_na_sentinel=False
+            )
+            day_numbers = np.asarray(day_numbers, dtype="datetime64[D]")
+        else:
+            # Each distinct date string is parsed once
+            date_codes, date_texts = pd.factorize(dates)
+            days = pd.to_datetime(date_texts, format="%Y-%m-%d", errors="coerce")
+            day_numbers = days.to_numpy().astype("datetime64[D]")
+        invalid = np.isnat(day_numbers)[date_codes]
+        report.add(rows[invalid] + 1, "Leave plan", dates[invalid], "date is not YYYY-MM-DD")
+
+        rows, occasions, date_codes = rows[~invalid], occasions[~invalid], date_codes[~invalid]
+        # Sorted by row and then date through one integer key, much cheaper than a lexsort
+        days = day_numbers[date_codes].astype(np.int64)
+        if len(days):
+            days -= days.min()
+            order = np.argsort(rows.astype(np.int64) * (int(days.max()) + 1) + days, kind="stable")
+        else:
+            order = np.arange(0)
+        occasion_codes, occasion_names = pd.factorize(occasions[order])
+        leaves = self.construct_shared(
+            Leave,
+            ocassion=(occasion_codes, occasion_names),
+            date=(date_codes[order], np.array(day_numbers.tolist(), dtype=object)),
+        )
+        return self.split_by_row(index, rows[order], leaves)
+
+    def extract_pairs(
+        self, column: pd.Series, report: IngestionReport
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Row labels, first and second values of all "[first, second]" pairs of the column,
+        in row order. Text outside the pairs is reported.
+
+        The joined column is split at every "]". A piece ending in "[first, second" is a
+        pair, split at its last comma like str.rsplit(",", 1), and whatever precedes its
+        "[" must be separators. Input files repeat the same skills and leaves, so the
+        pieces are factorized and each distinct piece is parsed once.
+        """
+        labels = column.index.to_numpy()
+        text = ROW_SEPARATOR.join(column.fillna("").astype(str).tolist())
+        codes, distinct, tail = self.split_distinct(text)
+
+        parsed = [self.parse_piece(piece) for piece in distinct]
+        is_pair = np.array([pair for pair, _, _, _, _ in parsed], dtype=bool)[codes]
+        first = np.array([first for _, first, _, _, _ in parsed], dtype=object)[codes]
+        second = np.array([second for _, _, second, _, _ in parsed], dtype=object)[codes]
+        rows_before = np.array([before for _, _, _, before, _ in parsed], dtype=np.int64)[codes]
+        rows_in = np.array([piece.count(ROW_SEPARATOR) for piece in distinct], dtype=np.int64)[codes]
+        # Position in the column of the row each piece starts in, and of its pair
+        starts = np.concatenate(([0], np.cumsum(rows_in)))
+        positions = starts[:-1] + rows_before
+
+        stray_rows, stray_texts = [], []
+        has_stray = np.array([bool(stray) for _, _, _, _, stray in parsed], dtype=bool)
+        for index in np.flatnonzero(has_stray[codes]).tolist():
+            for offset, stray_text in parsed[codes[index]][4]:
+                stray_rows.append(labels[starts[index] + offset])
+                stray_texts.append(stray_text)
+        for offset, segment in enumerate(tail.split(ROW_SEPARATOR)):
+            if segment.strip(PAIR_SEPARATORS):
+                stray_rows.append(labels[starts[-1] + offset])
+                stray_texts.append(segment.strip(PAIR_SEPARATORS))
+        report.add(
+            np.array(stray_rows, dtype=labels.dtype) + 1,
+            column.name,
+            stray_texts,
+            "text outside [name, value] pairs",
+        )
+        return labels[positions[is_pair]], first[is_pair], second[is_pair]
+
+    def split_distinct(self, text: str) -> Tuple[np.ndarray, List[str], str]:
+        """
+        (code of every piece closed by a "]" into distinct, the distinct pieces in order of
+        first appearance, the text after the last "]") of a joined column
+        """
+        if pa is not None:
+            split = pc.split_pattern(pa.array([text], pa.large_string()), "]").flatten()
+            encoded = pc.dictionary_encode(split.slice(0, len(split) - 1))
+            return encoded.indices.to_numpy(), encoded.dictionary.to_pylist(), split[-1].as_py()
+
+        split = text.split("]")
+        tail = split.pop()
+        pieces = np.empty(len(split), dtype=object)
+        pieces[:] = split
+        codes, distinct = pd.factorize(pieces)
+        return codes, list(distinct), tail
+
+    def parse_piece(self, piece: str) -> Tuple[bool, str, str, int, List[Tuple[int, str]]]:
+        """
+        (is a pair, stripped first and second value, row separators before the pair,
+        stray text with the offset of its row) of a piece of a joined column
+        """
+        before, bracket, inside = piece.rpartition("[")
+        is_pair = bool(bracket) and "," in inside and ROW_SEPARATOR not in inside
+        if is_pair:
+            first, second = inside.rsplit(",", 1)
+            first, second = first.strip(), second.strip()
+        else:
+            before, first, second = piece + "]", "", ""
+        stray = [
+            (offset, segment.strip(PAIR_SEPARATORS))
+            for offset, segment in enumerate(before.split(ROW_SEPARATOR))
+            if segment.strip(PAIR_SEPARATORS)
+        ]
+        return is_pair, first, second, before.count(ROW_SEPARATOR), stray
+
+    def construct_shared(self, model: type, **columns: Tuple[np.ndarray, np.ndarray]) -> List[BaseModel]:
+        """
+        One model per item, each field given as (codes per item, distinct values).
+        Items with the same values share one instance, the models are never mutated.
+        """
+        codes = [field_codes for field_codes, _ in columns.values()]
+        if not len(codes[0]):
+            return []
+        shape = [len(values) for _, values in columns.values()]
+        item_keys, keys = pd.factorize(np.ravel_multi_index(codes, shape))
+        value_codes = np.unravel_index(keys, shape)
+        instances = np.empty(len(keys), dtype=object)
+        instances[:] = self.construct_many(
+            model,
+            **{
+                name: values[value_code].tolist()
+                for (name, (_, values)), value_code in zip(columns.items(), value_codes)
+            },
+        )
+        return instances[item_keys].tolist()
+
+    def construct_many(self, model: type, **columns: List) -> List[BaseModel]:
+        """model.model_construct for every item of columns, given as lists of field values"""
+        names = list(columns)
+        construct = model.model_construct
+        return [construct(**dict(zip(names, values))) for values in zip(*columns.values())]
+
+    def split_by_row(self, index: pd.Index, rows: np.ndarray, items: List) -> List[List]:
+        """items (sorted by their row labels) split into one list per label of index"""
+        labels = index.to_numpy()
+        starts = np.searchsorted(rows, labels, side="left").tolist()
+        ends = np.searchsorted(rows, labels, side="right").tolist()
+        return [items[start:end] for start, end in zip(starts, ends)]
+
+    def log_report(self, report: IngestionReport):
+        if report.malformed:
+            self.logger.warning(report.summary())
+        else:
+            self.logger.info(f"{report.source}: loaded {report.loaded} of {report.rows} rows")
@@ -1,31 +1,191 @@
+import re
+import json
 import time
+import hashlib
+import threading
 import requests
 import base64
-from typing import List, Dict
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from requests.adapters import HTTPAdapter
 
 from src.models.story import Story
 from src.models.epic import Epic
 from src.models.employee import Employee
 from src.models.sprint import Sprint
+from src.settings.app_settings import AppSettings
+from src.utils.jira_account_cache import AccountIdCache
+from src.utils.jira_outbox import JiraOutbox
+from src.utils.rate_limit import RequestMetrics, TokenBucket, backoff_delay, parse_retry_after
 
-MAX_RETRIES = 3
-RETRY_DELAY = 2
+RETRY_STATUSES = {429, 502, 503, 504}
+# POSTs are not idempotent, only retry them when Jira says the request was not processed
+POST_RETRY_STATUSES = {429, 503}
+BULK_CREATE_LIMIT = 50
+SPRINT_MOVE_LIMIT = 50
+USER_PAGE_SIZE = 1000
+# Sites whose user listing hides emailAddress (user privacy settings), by site URL
+EMAIL_HIDDEN_SITES: Set[str] = set()
+SEARCH_PAGE_SIZE = 100
+SYNC_LABEL = "ai-planner"
 
 
 class JiraUtils:
-    JIRA_BASE_URL = "https://ashwathyashwathy761.atlassian.net/rest/api/3/issue"
+    JIRA_SITE_URL = "https://ashwathyashwathy761.atlassian.net"
+    JIRA_BASE_URL = f"{JIRA_SITE_URL}/rest/api/3/issue"
     PROJECT_KEY = "AI1"
 
-    def __init__(self, email: str, api_token: str, logger):
-        """Initialize JiraUtils with authentication"""
+    def __init__(
+        self,
+        email: str,
+        api_token: str,
+        logger,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 30.0,
+        account_cache: AccountIdCache = None,
+        rate_limiter: TokenBucket = None,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        outbox: JiraOutbox = None,
+        outbox_timeout: float = 300.0,
+        site_url: str = None,
+    ):
+        """
+        Initialize JiraUtils with authentication and a keep-alive connection pool.
+        With an outbox, writes are journaled there and sent by its flusher instead of inline.
+        """
         self.encoded_auth_string = self.get_token(api_token, email)
         self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json",
             "Authorization": f"Basic {self.encoded_auth_string}",
+            "Connection": "keep-alive",
         }
-        self.epic_mapping = {}  # To store {epic_title: epic_key}
         self.logger = logger
+        self.timeout = (connect_timeout, read_timeout)
+        if site_url:
+            # e.g. a local FakeJira for load tests
+            self.JIRA_SITE_URL = site_url.rstrip("/")
+            self.JIRA_BASE_URL = f"{self.JIRA_SITE_URL}/rest/api/3/issue"
+
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.requests_sent = 0
+        self.stats_lock = threading.Lock()
+        self.account_cache = account_cache or AccountIdCache(path=None, ttl_seconds=3600)
+        self.rate_limiter = rate_limiter or TokenBucket(rate=10, burst=20)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metrics = RequestMetrics()
+        self.outbox = outbox
+        self.outbox_timeout = outbox_timeout
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings, logger, outbox: JiraOutbox = None):
+        """Build a client configured from the app settings"""
+        return cls(
+            settings.JIRA_EMAIL,
+            settings.JIRA_API_TOKEN,
+            logger,
+            pool_size=settings.JIRA_POOL_SIZE,
+            connect_timeout=settings.JIRA_CONNECT_TIMEOUT,
+            read_timeout=settings.JIRA_READ_TIMEOUT,
+            account_cache=AccountIdCache(
+                path=settings.JIRA_ACCOUNT_CACHE_PATH,
+                ttl_seconds=settings.JIRA_ACCOUNT_CACHE_TTL_SECONDS,
+                logger=logger,
+            ),
+            rate_limiter=TokenBucket(
+                rate=settings.JIRA_RATE_LIMIT, burst=settings.JIRA_RATE_BURST
+            ),
+            max_retries=settings.JIRA_MAX_RETRIES,
+            backoff_base=settings.JIRA_BACKOFF_BASE,
+            backoff_max=settings.JIRA_BACKOFF_MAX,
+            outbox=outbox,
+            outbox_timeout=settings.JIRA_OUTBOX_WAIT_TIMEOUT,
+            site_url=settings.JIRA_SITE_URL,
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request over the pooled session, within the rate limit.
+        Throttled and transient failures are retried with jittered exponential backoff,
+        honouring Retry-After; a 429 also backs off the shared token bucket.
+        """
+        endpoint = self.get_endpoint(method, url)
+        retry_statuses = POST_RETRY_STATUSES if method == "POST" else RETRY_STATUSES
+        started = time.monotonic()
+        attempt = 0
+
+        while True:
+            self.rate_limiter.acquire()
+            with self.stats_lock:
+                self.requests_sent += 1
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    self.metrics.record(endpoint, time.monotonic() - started, attempt, True)
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                self.logger.warning(
+                    f"{endpoint} failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.status_code not in retry_statuses or attempt >= self.max_retries:
+                if response.status_code < 400:
+                    self.rate_limiter.reward()
+                self.metrics.record(
+                    endpoint, time.monotonic() - started, attempt, response.status_code >= 400
+                )
+                return response
+
+            delay = backoff_delay(
+                attempt,
+                self.backoff_base,
+                self.backoff_max,
+                parse_retry_after(response.headers.get("Retry-After")),
+            )
+            self.logger.warning(
+                f"{endpoint} returned {response.status_code}, retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+            )
+            if response.status_code == 429:
+                # The bucket holds every caller back until the throttle window has passed
+                self.rate_limiter.throttle(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def get_endpoint(self, method: str, url: str) -> str:
+        """Metrics label for a request, with issue keys and ids templated out"""
+        path = re.sub(r"^https?://[^/]+", "", url).split("?")[0]
+        path = re.sub(r"/[A-Z][A-Z0-9]*-\d+", "/{key}", path)
+        path = re.sub(r"(?<!/api)/\d+(?=/|$)", "/{id}", path)
+        return f"{method} {path}"
+
+    def get_stats(self) -> Dict:
+        """Connections opened versus requests sent, and per-endpoint metrics"""
+        pools = self.adapter.poolmanager.pools
+        with pools.lock:
+            opened = sum(pools[key].num_connections for key in pools.keys())
+        return {
+            "connections_opened": opened,
+            "requests_sent": self.requests_sent,
+            "endpoints": self.metrics.snapshot(),
+        }
+
+    def close(self):
+        self.logger.info(f"Closing Jira session: {self.get_stats()}")
+        self.session.close()
 
     def get_token(self, api_token: str, email: str):
         auth_string = f"{email}:{api_token}"
@@ -34,204 +194,526 @@ class JiraUtils:
         )
         return encoded_auth_string
 
-    def create_epic(self, epic: Epic) -> str:
-        """Create an epic in Jira and return its issue key"""
-        payload = {
-            "fields": {
+    def get_description(self, text: str) -> Dict:
+        """Wrap plain text in an Atlassian document"""
+        return {
+            "type": "doc",
+            "version": 1,
+            "content": [
+                {
+                    "type": "paragraph",
+                    "content": [{"type": "text", "text": text}],
+                }
+            ],
+        }
+
+    def get_epic_fields(self, epic: Epic, scope: str = "", ordinal: int = 0) -> Dict:
+        return self.with_sync_labels(
+            {
                 "project": {"key": self.PROJECT_KEY},
                 "summary": epic.title,
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": epic.description}],
-                        }
-                    ],
-                },
+                "description": self.get_description(epic.description),
                 "issuetype": {"name": "Epic"},
-            }
-        }
-
-        response = requests.post(self.JIRA_BASE_URL, headers=self.headers, json=payload)
-        if response.status_code == 201:
-            issue_key = response.json()["key"]
-            self.logger.info(f"Epic Created: {epic.title} -> {issue_key}")
-            return issue_key
-        else:
-            self.logger.info(f"Failed to create epic: {epic.title} -> {response.text}")
-            return None
+            },
+            scope,
+            ordinal,
+        )
 
-    def create_task(self, subtask_title: str, epic_key: str, description: str) -> str:
-        """Create a task in Jira and link it to an epic"""
-        payload = {
-            "fields": {
+    def get_task_fields(
+        self, subtask_title: str, epic_key: str, description: str, scope: str = "", ordinal: int = 0
+    ) -> Dict:
+        return self.with_sync_labels(
+            {
                 "project": {"key": self.PROJECT_KEY},
                 "summary": subtask_title,  # Task name is the subtask title
-                "description": {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": description}],
-                        }
-                    ],
-                },
+                "description": self.get_description(description),
                 "issuetype": {"name": "Story"},
                 "parent": {"key": epic_key},  # Link task to epic
                 # "customfield_10037": [epic_key],  # Epic link field
+            },
+            scope,
+            ordinal,
+        )
+
+    def get_ordinals(self, names: Iterable[str]) -> List[int]:
+        """How many earlier items share each name, so duplicate summaries stay distinct issues"""
+        seen = defaultdict(int)
+        ordinals = []
+        for name in names:
+            name = name.strip().lower()
+            ordinals.append(seen[name])
+            seen[name] += 1
+        return ordinals
+
+    def get_epics_fields(self, epics: List[Epic], scope: str = "") -> List[Dict]:
+        ordinals = self.get_ordinals(epic.title for epic in epics)
+        return [
+            self.get_epic_fields(epic, scope, ordinal) for epic, ordinal in zip(epics, ordinals)
+        ]
+
+    def get_stories_fields(
+        self, stories: List[Story], epic_mapping: Dict[str, str], scope: str = ""
+    ) -> List[Dict]:
+        epic_keys = [epic_mapping[story.epic.lower()] for story in stories]
+        ordinals = self.get_ordinals(
+            f"{epic_key}|{story.title}" for story, epic_key in zip(stories, epic_keys)
+        )
+        return [
+            self.get_task_fields(story.title, epic_key, story.description, scope, ordinal)
+            for story, epic_key, ordinal in zip(stories, epic_keys, ordinals)
+        ]
+
+    def with_sync_labels(self, fields: Dict, scope: str = "", ordinal: int = 0) -> Dict:
+        """
+        Label an issue with stable hashes so reruns can find it again:
+        the identity label covers the plan scope (project name), type, parent, summary and
+        the ordinal among same-summary issues, the revision label the full content.
+        """
+        identity = "|".join(
+            [
+                scope.strip().lower(),
+                fields["issuetype"]["name"],
+                fields.get("parent", {}).get("key", ""),
+                fields["summary"].strip().lower(),
+                str(ordinal),
+            ]
+        )
+        revision = json.dumps(fields, sort_keys=True)
+        fields["labels"] = [
+            SYNC_LABEL,
+            f"{SYNC_LABEL}-id-{hashlib.sha1(identity.encode('utf-8')).hexdigest()[:16]}",
+            f"{SYNC_LABEL}-rev-{hashlib.sha1(revision.encode('utf-8')).hexdigest()[:16]}",
+        ]
+        return fields
+
+    def get_sync_labels(self, labels: List[str]):
+        """(identity label, revision label) from an issue's labels"""
+        identity = next((label for label in labels if label.startswith(f"{SYNC_LABEL}-id-")), None)
+        revision = next((label for label in labels if label.startswith(f"{SYNC_LABEL}-rev-")), None)
+        return identity, revision
+
+    def search_synced_issues(self) -> Dict[str, Dict[str, str]]:
+        """
+        Issues this planner created earlier in PROJECT_KEY, by identity label.
+        Paginated JQL search that only fetches labels.
+        """
+        search_url = f"{self.JIRA_SITE_URL}/rest/api/3/search/jql"
+        payload = {
+            "jql": f'project = "{self.PROJECT_KEY}" AND labels = "{SYNC_LABEL}"',
+            "fields": ["labels"],
+            "maxResults": SEARCH_PAGE_SIZE,
+        }
+        existing = {}
+        while True:
+            response = self.request("POST", search_url, json=payload)
+            if response.status_code != 200:
+                self.logger.error(f"Failed to search existing issues: {response.text}")
+                raise RuntimeError(f"Failed to search existing issues: {response.text}")
+            data = response.json()
+            for issue in data.get("issues", []):
+                identity, revision = self.get_sync_labels(issue["fields"].get("labels", []))
+                if identity:
+                    existing[identity] = {"key": issue["key"], "revision": revision}
+            if data.get("isLast", True) or not data.get("nextPageToken"):
+                break
+            payload["nextPageToken"] = data["nextPageToken"]
+
+        self.logger.info(f"Found {len(existing)} previously synced issues in {self.PROJECT_KEY}")
+        return existing
+
+    def diff_issues(self, issues: List[Dict], existing: Dict[str, Dict[str, str]]):
+        """
+        Match issue fields against existing issues.
+        Returns the existing key per item (None when it must be created) and the (key, fields) needing an update.
+        """
+        keys = []
+        updates = []
+        for fields in issues:
+            identity, revision = self.get_sync_labels(fields["labels"])
+            match = existing.get(identity)
+            if match is None:
+                keys.append(None)
+                continue
+            keys.append(match["key"])
+            if match["revision"] != revision:
+                updates.append((match["key"], fields))
+        return keys, updates
+
+    def update_issue(self, issue_key: str, fields: Dict) -> bool:
+        """Update the editable fields of an existing issue"""
+        payload = {
+            "fields": {
+                name: value
+                for name, value in fields.items()
+                if name in ("summary", "description", "labels", "parent")
             }
         }
+        response = self.request("PUT", f"{self.JIRA_BASE_URL}/{issue_key}", json=payload)
+        if response.status_code == 204:
+            self.logger.info(f"Issue Updated: {fields['summary']} -> {issue_key}")
+            return True
+        self.logger.info(f"Failed to update {issue_key}: {response.text}")
+        return False
 
-        response = requests.post(self.JIRA_BASE_URL, headers=self.headers, json=payload)
+    def create_issue(self, fields: Dict) -> Optional[str]:
+        """Create a single issue and return its key"""
+        response = self.request("POST", self.JIRA_BASE_URL, json={"fields": fields})
         if response.status_code == 201:
-            issue_key = response.json()["key"]
+            return response.json()["key"]
+        self.logger.info(f"Failed to create issue: {fields['summary']} -> {response.text}")
+        return None
+
+    def create_epic(self, epic: Epic) -> str:
+        """Create an epic in Jira and return its issue key"""
+        issue_key = self.create_issue(self.get_epic_fields(epic))
+        if issue_key:
+            self.logger.info(f"Epic Created: {epic.title} -> {issue_key}")
+        return issue_key
+
+    def create_task(self, subtask_title: str, epic_key: str, description: str) -> str:
+        """Create a task in Jira and link it to an epic"""
+        issue_key = self.create_issue(self.get_task_fields(subtask_title, epic_key, description))
+        if issue_key:
             self.logger.info(
                 f"Task Created: {subtask_title} -> {issue_key} (Linked to {epic_key})"
             )
-            return issue_key
-        else:
-            self.logger.info(
-                f"Failed to create task: {subtask_title} -> {response.text}"
+        return issue_key
+
+    def bulk_create_issues(self, issues: List[Dict]) -> List[Optional[str]]:
+        """
+        Create issues through the bulk endpoint, BULK_CREATE_LIMIT per request.
+        Returns the created key for each input fields dict, None where that item failed.
+        """
+        keys = []
+        for i in range(0, len(issues), BULK_CREATE_LIMIT):
+            chunk = issues[i : i + BULK_CREATE_LIMIT]
+            payload = {"issueUpdates": [{"fields": fields} for fields in chunk]}
+            response = self.request("POST", f"{self.JIRA_BASE_URL}/bulk", json=payload)
+            keys.extend(self.parse_bulk_response(response, chunk))
+        return keys
+
+    def parse_bulk_response(self, response: requests.Response, chunk: List[Dict]) -> List[Optional[str]]:
+        """Line bulk results back up with the request items"""
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        if response.status_code not in (200, 201) and not data.get("issues"):
+            self.logger.info(f"Bulk create failed ({response.status_code}): {response.text}")
+            return [None] * len(chunk)
+
+        failed = set()
+        for error in data.get("errors", []):
+            index = error.get("failedElementNumber")
+            failed.add(index)
+            if index is not None and index < len(chunk):
+                self.logger.info(
+                    f"Failed to bulk create {chunk[index]['summary']}: {error.get('elementErrors')}"
+                )
+
+        created = iter(data.get("issues", []))
+        return [
+            None if index in failed else next(created, {}).get("key")
+            for index in range(len(chunk))
+        ]
+
+    def sync_issues(
+        self, issues: List[Dict], existing: Dict[str, Dict[str, str]], bulk: bool
+    ) -> List[Optional[str]]:
+        """
+        Reuse, update or create each issue and return its key (None when creation failed).
+        Creation goes through the bulk endpoint when enabled, failed items are retried one by one.
+        """
+        keys, updates = self.diff_issues(issues, existing)
+        missing = [index for index, key in enumerate(keys) if not key]
+
+        if self.outbox:
+            # The keys are needed downstream, so wait for the flusher to send these
+            entry_ids = self.outbox.enqueue(
+                "update_issue", [{"key": key, "fields": fields} for key, fields in updates]
+            )
+            entry_ids += self.outbox.enqueue(
+                "create_issue", [{"fields": issues[index], "bulk": bulk} for index in missing]
             )
-            return None
+            created = self.outbox.wait(entry_ids, self.outbox_timeout)[len(updates) :]
+            for index, key in zip(missing, created):
+                keys[index] = key
+        else:
+            for issue_key, fields in updates:
+                self.update_issue(issue_key, fields)
+            if bulk and missing:
+                created = self.bulk_create_issues([issues[index] for index in missing])
+                for index, key in zip(missing, created):
+                    keys[index] = key
+            for index in missing:
+                if not keys[index]:
+                    keys[index] = self.create_issue(issues[index])
+
+        self.logger.info(
+            f"Synced {len(issues)} issues: {len(missing)} created, {len(updates)} updated, "
+            f"{len(issues) - len(missing) - len(updates)} unchanged"
+        )
+        return keys
+
+    def process_epics_and_tasks(
+        self,
+        epics: List[Epic],
+        stories: List[Story],
+        bulk: bool = True,
+        reconcile: bool = True,
+        scope: str = "",
+    ):
+        """
+        Create epics and then link subtasks to the correct epics, then update the state and epic model.
+        With reconcile, issues created by an earlier run of the same plan (same scope) are matched by
+        their sync labels and only updated when their content changed, so reruns make close to zero writes.
+        """
+        existing = self.search_synced_issues() if reconcile else {}
 
-    def process_epics_and_tasks(self, epics: List[Epic], stories: List[Story]):
-        """Create epics and then link subtasks to the correct epics, then update the state and epic model"""
+        # Kept per call so concurrent plans sharing this client don't mix epics
+        epic_mapping = {}  # To store {epic_title: epic_key}
 
         # Step 1: Create epics and update the state with the Jira epic ID
-        for epic in epics:
-            try:
-                epic_key = self.create_epic(epic)
-                if epic_key:
-                    self.epic_mapping[epic.title.lower()] = epic_key  # Store epic ID
-                    epic.epic_id = epic_key
-            except Exception as e:
-                self.logger.info(f"Got an Exception {e}")
+        epic_keys = self.sync_issues(self.get_epics_fields(epics, scope), existing, bulk)
+        for epic, epic_key in zip(epics, epic_keys):
+            if epic_key:
+                self.logger.info(f"Epic: {epic.title} -> {epic_key}")
+                epic_mapping[epic.title.lower()] = epic_key  # Store epic ID
+                epic.epic_id = epic_key
 
         # Step 2: Create subtasks as individual tasks, linking them to the correct epic and updating the Story model
-        stories_dict = {}
         for story in stories:
-            try:
-                if story.epic.lower() in self.epic_mapping.keys():
-                    epic_key = self.epic_mapping[story.epic.lower()]
-
-                    # Retry loop for create_task
-                    task_key = None
-                    for attempt in range(1, MAX_RETRIES + 1):
-                        task_key = self.create_task(
-                            story.title, epic_key, story.description
-                        )
-                        if task_key:
-                            break  # Exit retry loop if successful
-                        self.logger.warning(
-                            f"Retry {attempt}/{MAX_RETRIES}: Failed to create task for {story.title}. Retrying in {RETRY_DELAY}s..."
-                        )
-                        time.sleep(RETRY_DELAY)  # Wait before retrying
-
-                    if task_key:
-                        story.issue_id = task_key
-                        stories_dict[story.issue_id] = story
-                    else:
-                        self.logger.error(
-                            f"Failed to create task for {story.title} after {MAX_RETRIES} retries."
-                        )
-                        raise Exception(
-                            f"Failed to create task for {story.title} after {MAX_RETRIES} retries."
-                        )
-                else:
-                    self.logger.info(
-                        f"Skipping Story: {story.title} (No matching epic found)"
-                    )
-                    raise RuntimeError(
-                        f"Skipping Story: {story.title} (No matching epic found)"
-                    )
-
-            except Exception as e:
-                self.logger.error(f"Got an Exception: {e}")
-                raise Exception(f"Got an Exception: {e}")
+            if story.epic.lower() not in epic_mapping.keys():
+                message = f"Skipping Story: {story.title} (No matching epic found)"
+                self.logger.error(message)
+                raise RuntimeError(message)
+
+        task_keys = self.sync_issues(
+            self.get_stories_fields(stories, epic_mapping, scope), existing, bulk
+        )
+
+        stories_dict = {}
+        for story, task_key in zip(stories, task_keys):
+            epic_key = epic_mapping[story.epic.lower()]
+            if not task_key:
+                self.logger.error(f"Failed to create task for {story.title}.")
+                raise Exception(f"Failed to create task for {story.title}.")
+            self.logger.info(f"Task: {story.title} -> {task_key} (Linked to {epic_key})")
+            story.issue_id = task_key
+            stories_dict[story.issue_id] = story
 
         self.logger.info("Processed epics and tasks, updated stories and epics.")
         return stories_dict
 
-    def assign_story(self, story: Story) -> bool:
-        """Assign a story to a person using their email"""
-        # Get the account ID from email
-        user_info_url = f"https://ashwathyashwathy761.atlassian.net/rest/api/3/user/search?query={story.assignee}"
-        user_response = requests.get(user_info_url, headers=self.headers)
+    def warm_account_ids(self, emails: List[str]):
+        """
+        Resolve the distinct emails missing from the account cache with a paginated user
+        listing. When the site hides emailAddress in the listing, which is seen on its
+        first page and remembered per site, each missing email is looked up once instead.
+        """
+        missing = {email.lower() for email in emails if not self.account_cache.get(email)}
+        if not missing:
+            return
+
+        found = {}
+        start_at = 0
+        while self.JIRA_SITE_URL not in EMAIL_HIDDEN_SITES:
+            users_url = f"{self.JIRA_SITE_URL}/rest/api/3/users/search"
+            response = self.request(
+                "GET", users_url, params={"startAt": start_at, "maxResults": USER_PAGE_SIZE}
+            )
+            if response.status_code != 200:
+                self.logger.info(f"Failed to list Jira users: {response.text}")
+                break
+            users = response.json()
+            if users and not any(user.get("emailAddress") for user in users):
+                self.logger.info(f"{self.JIRA_SITE_URL} hides user emails, looking them up one by one")
+                EMAIL_HIDDEN_SITES.add(self.JIRA_SITE_URL)
+                break
+            for user in users:
+                email = (user.get("emailAddress") or "").lower()
+                if email in missing:
+                    found[email] = user["accountId"]
+            if len(users) < USER_PAGE_SIZE or len(found) == len(missing):
+                break
+            start_at += USER_PAGE_SIZE
+        self.account_cache.set_many(found)
+
+        if self.JIRA_SITE_URL in EMAIL_HIDDEN_SITES:
+            for email in sorted(missing - set(found)):
+                account_id = self.get_account_id(email)
+                if account_id:
+                    found[email] = account_id
+        self.logger.info(f"Resolved {len(found)}/{len(missing)} uncached Jira account IDs")
+
+    def get_account_id(self, email: str) -> Optional[str]:
+        """Get the account ID for an email, from the cache when possible"""
+        account_id = self.account_cache.get(email)
+        if account_id:
+            return account_id
+
+        user_info_url = f"{self.JIRA_SITE_URL}/rest/api/3/user/search"
+        user_response = self.request("GET", user_info_url, params={"query": email})
         if user_response.status_code == 200 and user_response.json():
             account_id = user_response.json()[0]["accountId"]
-        else:
-            self.logger.info(
-                f"Failed to retrieve account ID for {story.assignee}: {user_response.text}"
+            self.account_cache.set(email, account_id)
+            return account_id
+
+        self.logger.info(
+            f"Failed to retrieve account ID for {email}: {user_response.text}"
+        )
+        return None
+
+    def assign_story(self, story: Story) -> Optional[bool]:
+        """Assign a story to a person using their email, None while queued in the outbox"""
+        return self.assign_stories([story])[0]
+
+    def assign_stories(self, stories: List[Story]) -> List[Optional[bool]]:
+        """
+        Assign stories, which carry the assignee email.
+        With an outbox the assignments are handed off and reported as pending (None).
+        """
+        if self.outbox:
+            self.outbox.enqueue(
+                "assign_issue",
+                [{"key": story.issue_id, "email": story.assignee} for story in stories],
             )
-            return False
-        
-        # Assign the issue
-        assign_url = f"{self.JIRA_BASE_URL}/{story.issue_id}/assignee"
-        payload = {"accountId": account_id}
-        assign_response = requests.put(assign_url, headers=self.headers, json=payload)
-        if assign_response.status_code == 204:
-            self.logger.info(f"Successfully assigned {story.title} to {story.assignee}")
-            return True
-        else:
+            self.logger.info(f"Queued {len(stories)} assignments")
+            return [None] * len(stories)
+
+        results = []
+        for story in stories:
+            assigned = self.assign_issue(story.issue_id, story.assignee)
+            if assigned:
+                self.logger.info(f"Successfully assigned {story.title} to {story.assignee}")
+            results.append(assigned)
+        return results
+
+    def assign_issue(self, issue_id: str, email: str) -> bool:
+        """Assign an issue to the Jira user with this email"""
+        for attempt in range(2):
+            # Get the account ID from email
+            account_id = self.get_account_id(email)
+            if not account_id:
+                return False
+
+            # Assign the issue
+            assign_url = f"{self.JIRA_BASE_URL}/{issue_id}/assignee"
+            payload = {"accountId": account_id}
+            assign_response = self.request("PUT", assign_url, json=payload)
+            if assign_response.status_code == 204:
+                return True
+            if assign_response.status_code == 404 and attempt == 0:
+                # The cached account may be gone, look it up again once
+                self.account_cache.invalidate(email)
+                continue
+
             self.logger.info(
-                f"Failed to assign {story.issue_id}: {assign_response.text}"
+                f"Failed to assign {issue_id}: {assign_response.text}"
             )
             return False
+        return False
 
-    def create_sprint(self, sprint: Sprint) -> bool:
-        """Create sprint on Jira Board"""
-        user_info_url = "https://ashwathyashwathy761.atlassian.net/rest/agile/1.0/sprint"
-        payload = {
+    def get_sprint_fields(self, sprint: Sprint) -> Dict:
+        return {
             "name": sprint.name,
             "startDate": sprint.startDate.isoformat(),
             "endDate": sprint.endDate.isoformat(),
             "originBoardId": "2"
         }
 
-        response = requests.post(user_info_url, headers=self.headers, json=payload)
+    def create_sprint(self, sprint: Sprint) -> bool:
+        """Create sprint on Jira Board"""
+        fields = self.get_sprint_fields(sprint)
+        if self.outbox:
+            # Stories are moved by sprint id, so wait for it
+            entry_ids = self.outbox.enqueue("create_sprint", [fields])
+            sprint_id = self.outbox.wait(entry_ids, self.outbox_timeout)[0]
+        else:
+            sprint_id = self.create_board_sprint(fields)
+
+        if sprint_id:
+            sprint.id = sprint_id
+            return True
+        return False
+
+    def create_board_sprint(self, fields: Dict) -> Optional[int]:
+        """Create a sprint from its fields and return its id"""
+        user_info_url = f"{self.JIRA_SITE_URL}/rest/agile/1.0/sprint"
+        response = self.request("POST", user_info_url, json=fields)
 
         if response.status_code == 201:
             response_data = response.json()
             if response_data and "id" in response_data:
-                sprint.id = response_data["id"]
-                return True
+                return response_data["id"]
             else:
                 self.logger.error(f"Unexpected response: {response_data}")
         else:
             self.logger.error(
-                f"Failed to create sprint {sprint.name}, Response: {response.text}"
+                f"Failed to create sprint {fields['name']}, Response: {response.text}"
             )
-        return False
-    
-    def assign_stories_to_sprint(self, sprint: Sprint) -> bool:
-        """Assign all stories in a sprint to that sprint in Jira"""
+        return None
+
+    def assign_stories_to_sprint(self, sprint: Sprint) -> Dict[str, Optional[bool]]:
+        """
+        Move all stories in a sprint into that sprint in Jira.
+        Returns whether each issue made it into the sprint, None while queued in the outbox.
+        """
+        issue_ids = [story.issue_id for story in sprint.stories.values()]
         if not sprint.id:
             self.logger.error("Sprint ID is missing. Cannot assign stories.")
-            return False
-
-        success_count = 0
-        total_stories = len(sprint.stories)
+            return {issue_id: False for issue_id in issue_ids}
 
-        for story in sprint.stories.values():
-            issue_url = f"https://ashwathyashwathy761.atlassian.net/rest/api/2/issue/{story.issue_id}"
-            payload = {
-                "fields": {
-                    "customfield_10020": sprint.id  # Sprint ID field in Jira
-                }
-            }
+        if self.outbox:
+            self.outbox.enqueue(
+                "move_to_sprint",
+                [{"sprint_id": sprint.id, "key": issue_id} for issue_id in issue_ids],
+            )
+            self.logger.info(f"Queued {len(issue_ids)} stories for Sprint {sprint.id}")
+            return dict.fromkeys(issue_ids, None)
+        return self.move_issues_to_sprint(sprint.id, issue_ids)
 
-            response = requests.put(issue_url, headers=self.headers, json=payload)
+    def move_issues_to_sprint(self, sprint_id: int, issue_ids: List[str]) -> Dict[str, bool]:
+        """Move issues into a sprint, SPRINT_MOVE_LIMIT issues per request"""
+        status = {}
+        move_url = f"{self.JIRA_SITE_URL}/rest/agile/1.0/sprint/{sprint_id}/issue"
+        for i in range(0, len(issue_ids), SPRINT_MOVE_LIMIT):
+            chunk = issue_ids[i : i + SPRINT_MOVE_LIMIT]
+            response = self.request("POST", move_url, json={"issues": chunk})
 
             if response.status_code == 204:
-                self.logger.info(f"Story {story.issue_id} assigned to Sprint {sprint.id}")
-                success_count += 1
+                self.logger.info(f"Stories {', '.join(chunk)} assigned to Sprint {sprint_id}")
+                status.update(dict.fromkeys(chunk, True))
             else:
                 self.logger.error(
-                    f"Failed to assign Story {story.issue_id} to Sprint {sprint.id}, Response: {response.text}"
+                    f"Failed to move {len(chunk)} stories to Sprint {sprint_id}, retrying one by one. Response: {response.text}"
                 )
+                for issue_id in chunk:
+                    status[issue_id] = self.assign_story_to_sprint(issue_id, sprint_id)
+
+        self.logger.info(
+            f"{sum(status.values())}/{len(status)} stories assigned to Sprint {sprint_id}"
+        )
+        return status
+
+    def assign_story_to_sprint(self, issue_id: str, sprint_id: int) -> bool:
+        """Assign a single story to a sprint through its sprint field"""
+        issue_url = f"{self.JIRA_SITE_URL}/rest/api/2/issue/{issue_id}"
+        payload = {
+            "fields": {
+                "customfield_10020": sprint_id  # Sprint ID field in Jira
+            }
+        }
 
-        return success_count == total_stories
\ No newline at end of file
+        response = self.request("PUT", issue_url, json=payload)
+
+        if response.status_code == 204:
+            self.logger.info(f"Story {issue_id} assigned to Sprint {sprint_id}")
+            return True
+        self.logger.error(
+            f"Failed to assign Story {issue_id} to Sprint {sprint_id}, Response: {response.text}"
+        )
+        return False
@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AccountIdCache:
+    """Email -> Jira accountId cache, optionally persisted to a JSON file with a TTL"""
+
+    def __init__(self, path: Optional[str], ttl_seconds: int, logger=None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, Dict] = self.load()
+
+    def load(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable account cache {self.path}: {e}")
+            return {}
+
+    def save(self):
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(self.entries, cache_file)
+        os.replace(temp_path, self.path)
+
+    def get(self, email: str) -> Optional[str]:
+        entry = self.entries.get(email.lower())
+        if entry is None or time.time() - entry["fetched_at"] > self.ttl_seconds:
+            return None
+        return entry["account_id"]
+
+    def set_many(self, account_ids: Dict[str, str]):
+        now = time.time()
+        with self.lock:
+            for email, account_id in account_ids.items():
+                self.entries[email.lower()] = {"account_id": account_id, "fetched_at": now}
+            self.save()
+
+    def set(self, email: str, account_id: str):
+        self.set_many({email: account_id})
+
+    def invalidate(self, email: str):
+        with self.lock:
+            if self.entries.pop(email.lower(), None) is not None:
+                self.save()
@@ -0,0 +1,161 @@
+"""
+Throughput benchmark for the Jira clients against the in-process FakeJira.
+
+    python -m src.utils.jira_benchmark --stories 500 --latency 0.05 --throttle-rate 0.02
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date, timedelta
+
+from src.models.epic import Epic
+from src.models.sprint import Sprint
+from src.models.story import Story
+from src.utils.async_jira import AsyncJiraUtils
+from src.utils.fake_jira import FakeJira
+from src.utils.jira import JiraUtils
+from src.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+def get_plan(epic_count: int, story_count: int):
+    epics = [
+        Epic(epic_id="", title=f"Epic {i}", description=f"Epic {i}", stories=[])
+        for i in range(epic_count)
+    ]
+    stories = [
+        Story(
+            issue_id="",
+            title=f"Story {i}",
+            description=f"Story {i} of the benchmark plan",
+            assignee=f"dev{i % 10}@example.com",
+            epic=f"Epic {i % epic_count}",
+            estimate=1,
+            sprint="",
+        )
+        for i in range(story_count)
+    ]
+    return epics, stories
+
+
+def get_sprint(stories) -> Sprint:
+    return Sprint(
+        id=0,
+        name="Benchmark Sprint",
+        goal="",
+        startDate=date.today(),
+        endDate=date.today() + timedelta(days=14),
+        stories={story.issue_id: story for story in stories},
+    )
+
+
+def timed(name: str, count: int, func, *args, **kwargs):
+    started = time.monotonic()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        # Injected 5xx on non-retried POSTs can fail a phase, as they would against Jira
+        print(f"{name:<28} failed after {time.monotonic() - started:.2f}s: {e}")
+        return None
+    elapsed = time.monotonic() - started
+    print(f"{name:<28} {count:>6} items {elapsed:>8.2f}s {count / elapsed:>9.1f}/s")
+    return result
+
+
+def run(args):
+    with FakeJira(
+        latency=args.latency,
+        jitter=args.latency / 2,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ) as fake:
+        jira = JiraUtils(
+            "benchmark@example.com",
+            "token",
+            logger,
+            pool_size=args.concurrency,
+            rate_limiter=TokenBucket(rate=args.rate_limit, burst=args.concurrency * 2),
+            backoff_base=0.05,
+            site_url=fake.url,
+        )
+        async_jira = AsyncJiraUtils(jira, max_in_flight=args.concurrency)
+
+        for bulk in (True, False):
+            label = "bulk" if bulk else "single"
+            epics, stories = get_plan(args.epics, args.stories)
+            timed(
+                f"create ({label})",
+                len(epics) + len(stories),
+                jira.process_epics_and_tasks,
+                epics,
+                stories,
+                bulk=bulk,
+                reconcile=False,
+            )
+            epics, stories = get_plan(args.epics, args.stories)
+            timed(
+                f"async create ({label})",
+                len(epics) + len(stories),
+                lambda: asyncio.run(
+                    async_jira.process_epics_and_tasks(epics, stories, bulk=bulk, reconcile=False)
+                ),
+            )
+
+        timed(
+            "rerun (reconcile)",
+            len(epics) + len(stories),
+            jira.process_epics_and_tasks,
+            epics,
+            stories,
+        )
+        timed("assign", len(stories), jira.assign_stories, stories)
+        jira.account_cache.entries.clear()
+        timed(
+            "async assign", len(stories), lambda: asyncio.run(async_jira.assign_stories(stories))
+        )
+
+        sprint = get_sprint(stories)
+        jira.create_sprint(sprint)
+        timed("sprint move", len(stories), jira.assign_stories_to_sprint, sprint)
+        timed(
+            "async sprint move",
+            len(stories),
+            lambda: asyncio.run(async_jira.assign_stories_to_sprint(sprint)),
+        )
+
+        print(f"\nrequests received by FakeJira: {fake.requests}")
+        stats = jira.get_stats()
+        print(
+            f"connections opened: {stats['connections_opened']}, "
+            f"requests sent: {stats['requests_sent']}"
+        )
+        for endpoint, metrics in sorted(stats["endpoints"].items()):
+            print(
+                f"{endpoint:<48} {metrics['requests']:>6} req {metrics['retries']:>5} retries "
+                f"{metrics['errors']:>4} errors {metrics['avg_latency'] * 1000:>8.1f}ms avg"
+            )
+        jira.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--epics", type=int, default=10)
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="share of 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 5xx")
+    parser.add_argument("--retry-after", type=float, default=0.2)
+    parser.add_argument("--rate-limit", type=float, default=100.0, help="client requests/s")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    logging.basicConfig(level=logging.WARNING)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Crash-safe outbox for Jira writes"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+PENDING = "pending"
+SENDING = "sending"
+DONE = "done"
+FAILED = "failed"
+
+
+class JiraOutbox:
+    """
+    SQLite (WAL) journal of Jira mutations.
+
+    Every write is recorded as a pending entry before it is sent and marked done with
+    its result (issue key, sprint id, ...) once Jira acknowledges it. Entries that were
+    being sent when the process died are put back to pending on startup, so a restart
+    resumes after the last acknowledged entry. One flusher should drain a given file.
+    """
+
+    def __init__(self, path: str, logger=None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        # Signalled on every enqueue / ack so the flusher and waiters wake up
+        self.changed = threading.Condition(self.lock)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jira_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS jira_outbox_status ON jira_outbox (status, id)"
+        )
+        self.connection.commit()
+        self.recover()
+
+    def recover(self):
+        """Put entries interrupted mid-send back in the queue"""
+        with self.lock:
+            cursor = self.connection.execute(
+                "UPDATE jira_outbox SET status = ?, updated_at = ? WHERE status = ?",
+                (PENDING, time.time(), SENDING),
+            )
+            self.connection.commit()
+            pending = self.connection.execute(
+                "SELECT COUNT(*) FROM jira_outbox WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+        if pending:
+            self.logger.info(
+                f"Jira outbox has {pending} pending entries ({cursor.rowcount} interrupted mid-send)"
+            )
+
+    def enqueue(self, kind: str, payloads: List[Dict]) -> List[int]:
+        """Durably record writes of one kind, returns their entry ids"""
+        if not payloads:
+            return []
+        now = time.time()
+        with self.changed:
+            ids = [
+                self.connection.execute(
+                    "INSERT INTO jira_outbox (kind, payload, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kind, json.dumps(payload), PENDING, now, now),
+                ).lastrowid
+                for payload in payloads
+            ]
+            self.connection.commit()
+            self.changed.notify_all()
+        return ids
+
+    def claim(self, limit: int) -> List[Dict[str, Any]]:
+        """Oldest pending entries, marked as being sent"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, kind, payload, attempts FROM jira_outbox "
+                "WHERE status = ? ORDER BY id LIMIT ?",
+                (PENDING, limit),
+            ).fetchall()
+            self.connection.executemany(
+                "UPDATE jira_outbox SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                [(SENDING, time.time(), row[0]) for row in rows],
+            )
+            self.connection.commit()
+        return [
+            {"id": row[0], "kind": row[1], "payload": json.loads(row[2]), "attempts": row[3] + 1}
+            for row in rows
+        ]
+
+    def ack(self, results: Dict[int, Any]):
+        """Mark entries sent, with what Jira returned for each"""
+        self.finish(
+            [(DONE, json.dumps(result), None, entry_id) for entry_id, result in results.items()]
+        )
+
+    def fail(self, errors: Dict[int, str]):
+        """Mark entries as permanently failed"""
+        self.finish([(FAILED, None, error, entry_id) for entry_id, error in errors.items()])
+
+    def release(self, entry_ids: List[int], error: str):
+        """Return entries to the queue after a transient failure"""
+        self.finish([(PENDING, None, error, entry_id) for entry_id in entry_ids])
+
+    def finish(self, rows: List[tuple]):
+        if not rows:
+            return
+        now = time.time()
+        with self.changed:
+            self.connection.executemany(
+                "UPDATE jira_outbox SET status = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                [
+                    (status, result, error, now, entry_id, SENDING)
+                    for status, result, error, entry_id in rows
+                ],
+            )
+            self.connection.commit()
+            self.changed.notify_all()
+
+    def get_entries(self, entry_ids: List[int]) -> Dict[int, tuple]:
+        """{entry id: (status, result)}, callers hold the lock"""
+        placeholders = ",".join("?" * len(entry_ids))
+        rows = self.connection.execute(
+            f"SELECT id, status, result FROM jira_outbox WHERE id IN ({placeholders})",
+            entry_ids,
+        ).fetchall()
+        return {row[0]: (row[1], json.loads(row[2]) if row[2] else None) for row in rows}
+
+    def wait(self, entry_ids: List[int], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Block until the entries are done or failed and return their results,
+        None for failed entries. Raises TimeoutError, the entries stay queued.
+        """
+        if not entry_ids:
+            return []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.changed:
+            while True:
+                entries = self.get_entries(entry_ids)
+                if all(entries[entry_id][0] in (DONE, FAILED) for entry_id in entry_ids):
+                    return [entries[entry_id][1] for entry_id in entry_ids]
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Jira outbox entries not flushed after {timeout}s")
+                self.changed.wait(remaining)
+
+    def wait_for_work(self, timeout: float):
+        with self.changed:
+            pending = self.connection.execute(
+                "SELECT 1 FROM jira_outbox WHERE status = ? LIMIT 1", (PENDING,)
+            ).fetchone()
+            if not pending:
+                self.changed.wait(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT status, COUNT(*) FROM jira_outbox GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class JiraOutboxFlusher:
+    """
+    Background thread draining a JiraOutbox through a JiraUtils client.
+
+    Each batch is grouped by kind so creations go out through the bulk endpoint and
+    sprint moves through one request per sprint. Creations that may already have been
+    sent before a crash are first looked up by their sync labels, so they are not duplicated.
+    """
+
+    def __init__(
+        self,
+        outbox: JiraOutbox,
+        jira_utils,
+        batch_size: int = 50,
+        max_attempts: int = 5,
+        poll_interval: float = 1.0,
+        logger=None,
+    ):
+        self.outbox = outbox
+        self.jira_utils = jira_utils
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.exit_lock = threading.Lock()
+        self.exited = False
+        self.on_exit: Optional[Callable[[], None]] = None
+        self.handlers = {
+            "create_issue": self.create_issues,
+            "update_issue": self.update_issues,
+            "assign_issue": self.assign_issues,
+            "create_sprint": self.create_sprints,
+            "move_to_sprint": self.move_to_sprints,
+        }
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="jira-outbox", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0, on_exit: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Stop after the batch in flight, whatever is still pending stays in the outbox.
+        on_exit (e.g. closing the outbox) runs once the thread is done: here when it exits
+        within timeout, otherwise on the thread itself when its batch finishes.
+        Returns whether the thread exited within timeout.
+        """
+        self.stopped.set()
+        with self.outbox.changed:
+            self.outbox.changed.notify_all()
+        if self.thread:
+            self.thread.join(timeout)
+
+        with self.exit_lock:
+            running = self.thread is not None and not self.exited
+            if running:
+                self.on_exit = on_exit
+        if running:
+            self.logger.warning(
+                f"Jira outbox flusher still busy after {timeout}s, closing when it finishes"
+            )
+            return False
+        if on_exit:
+            on_exit()
+        return True
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                batch = self.outbox.claim(self.batch_size)
+                if not batch:
+                    self.outbox.wait_for_work(self.poll_interval)
+                    continue
+                self.flush(batch)
+        finally:
+            with self.exit_lock:
+                self.exited = True
+                on_exit = self.on_exit
+            if on_exit:
+                on_exit()
+
+    def flush(self, batch: List[Dict[str, Any]]):
+        by_kind = defaultdict(list)
+        for entry in batch:
+            by_kind[entry["kind"]].append(entry)
+
+        for kind, entries in by_kind.items():
+            handler = self.handlers.get(kind)
+            if handler is None:
+                self.outbox.fail(
+                    {entry["id"]: f"Unknown outbox entry kind {kind}" for entry in entries}
+                )
+                continue
+            try:
+                handler(entries)
+            except Exception as e:
+                self.logger.error(
+                    f"Jira outbox flush of {len(entries)} {kind} entries failed: {e!r}"
+                )
+                self.outbox.fail(
+                    {
+                        entry["id"]: repr(e)
+                        for entry in entries
+                        if entry["attempts"] >= self.max_attempts
+                    }
+                )
+                self.outbox.release(
+                    [entry["id"] for entry in entries if entry["attempts"] < self.max_attempts],
+                    repr(e),
+                )
+                self.stopped.wait(self.poll_interval)
+
+    def settle(self, entries: List[Dict[str, Any]], results: List[Any], error: str):
+        """Ack entries with a result, fail the ones without"""
+        self.outbox.ack(
+            {entry["id"]: result for entry, result in zip(entries, results) if result}
+        )
+        self.outbox.fail(
+            {entry["id"]: error for entry, result in zip(entries, results) if not result}
+        )
+
+    def create_issues(self, entries: List[Dict[str, Any]]):
+        jira = self.jira_utils
+        fields = [entry["payload"]["fields"] for entry in entries]
+        keys = [None] * len(entries)
+
+        # Retried entries may have reached Jira before the crash, find those by their labels
+        if any(entry["attempts"] > 1 for entry in entries):
+            keys, _ = jira.diff_issues(fields, jira.search_synced_issues())
+
+        missing = [index for index, key in enumerate(keys) if not key]
+        bulk = [index for index in missing if entries[index]["payload"].get("bulk")]
+        if bulk:
+            created = jira.bulk_create_issues([fields[index] for index in bulk])
+            for index, key in zip(bulk, created):
+                keys[index] = key
+        for index in missing:
+            if not keys[index]:
+                keys[index] = jira.create_issue(fields[index])
+
+        self.settle(entries, keys, "Issue creation failed")
+
+    def update_issues(self, entries: List[Dict[str, Any]]):
+        results = [
+            self.jira_utils.update_issue(entry["payload"]["key"], entry["payload"]["fields"])
+            for entry in entries
+        ]
+        self.settle(entries, results, "Issue update failed")
+
+    def assign_issues(self, entries: List[Dict[str, Any]]):
+        jira = self.jira_utils
+        jira.warm_account_ids([entry["payload"]["email"] for entry in entries])
+        results = [
+            jira.assign_issue(entry["payload"]["key"], entry["payload"]["email"])
+            for entry in entries
+        ]
+        self.settle(entries, results, "Assignment failed")
+
+    def create_sprints(self, entries: List[Dict[str, Any]]):
+        results = [self.jira_utils.create_board_sprint(entry["payload"]) for entry in entries]
+        self.settle(entries, results, "Sprint creation failed")
+
+    def move_to_sprints(self, entries: List[Dict[str, Any]]):
+        by_sprint = defaultdict(list)
+        for entry in entries:
+            by_sprint[entry["payload"]["sprint_id"]].append(entry)
+
+        for sprint_id, sprint_entries in by_sprint.items():
+            status = self.jira_utils.move_issues_to_sprint(
+                sprint_id, [entry["payload"]["key"] for entry in sprint_entries]
+            )
+            self.settle(
+                sprint_entries,
+                [status.get(entry["payload"]["key"]) for entry in sprint_entries],
+                f"Move to sprint {sprint_id} failed",
+            )
@@ -0,0 +1,153 @@
+"""Persistent response cache for WatsonX chat models"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+
+class LLMResponseCache(BaseCache):
+    """
+    SQLite-backed LLM response cache.
+
+    Our chains decode greedily at temperature 0, so a response is fully determined by
+    the model id, decoding params, bound structured-output schema (all part of
+    LangChain's llm_string) and the rendered prompt. Entries expire after ttl_seconds
+    and the least recently used ones are evicted beyond max_entries / max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: int,
+        max_entries: int,
+        max_bytes: int,
+        logger=None,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self.connection.commit()
+
+    def get_key(self, prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self.get_key(prompt, llm_string)
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self.connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self.connection.commit()
+                self.misses += 1
+                return None
+
+            self.connection.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self.connection.commit()
+            self.hits += 1
+
+        return [self.load_generation(item) for item in json.loads(row[0])]
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: Sequence[Generation]
+    ) -> None:
+        key = self.get_key(prompt, llm_string)
+        value = json.dumps([self.dump_generation(gen) for gen in return_val])
+        now = time.time()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self.evict(now)
+            self.connection.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self.lock:
+            self.connection.execute("DELETE FROM llm_cache")
+            self.connection.commit()
+
+    def evict(self, now: float):
+        """Drop expired entries, then least recently used ones until under the limits"""
+        self.connection.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        count, size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, entry_size in self.connection.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at"
+        ).fetchall():
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            self.connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            count -= 1
+            size -= entry_size
+            evicted += 1
+        self.logger.debug(f"Evicted {evicted} LLM cache entries")
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            count, size = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": count, "bytes": size}
+
+    def dump_generation(self, generation: Generation) -> Dict[str, Any]:
+        if isinstance(generation, ChatGeneration):
+            return {
+                "message": message_to_dict(generation.message),
+                "generation_info": generation.generation_info,
+            }
+        return {"text": generation.text, "generation_info": generation.generation_info}
+
+    def load_generation(self, item: Dict[str, Any]) -> Generation:
+        if "message" in item:
+            return ChatGeneration(
+                message=messages_from_dict([item["message"]])[0],
+                generation_info=item["generation_info"],
+            )
+        return Generation(text=item["text"], generation_info=item["generation_info"])
@@ -0,0 +1,131 @@
+"""Process-wide cache of parsed input files and the indexes derived from them"""
+
+import hashlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class ParsedFileCache:
+    """
+    Parsed file contents keyed by (kind, absolute path).
+
+    An entry is reused while the file's mtime and size are unchanged. When they change
+    the file is hashed, and it is only parsed again when the content hash differs, so
+    touching or re-copying a file costs one hash. Parsed values are shared between
+    requests and must be treated as read-only.
+
+    Indexes built from a cached value are memoized on its entry with derive() and are
+    dropped together with it when the file changes.
+
+    At most max_entries files are kept, the least recently used is evicted first, and
+    entries whose file was deleted are dropped whenever a new file is parsed.
+    """
+
+    def __init__(self, logger=None, max_entries: int = 16):
+        self.logger = logger or logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.by_value: Dict[int, Dict[str, Any]] = {}
+        self.locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, kind: str, parse: Callable[[str], Any]) -> Any:
+        """The parsed contents of path, parse(path) runs only when the content changed"""
+        key = (kind, os.path.abspath(path))
+        with self.lock:
+            key_lock = self.locks.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same file wait for one parse
+        with key_lock:
+            stat = os.stat(path)
+            entry = self.entries.get(key)
+            if entry and (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+                self.touch(key)
+                self.hits += 1
+                return entry["value"]
+
+            digest = self.hash_file(path)
+            if entry and entry["digest"] == digest:
+                entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+                self.touch(key)
+                self.hits += 1
+                return entry["value"]
+
+            self.misses += 1
+            self.logger.info(f"Parsing {kind} from {path}")
+            value = parse(path)
+            with self.lock:
+                if entry:
+                    self.by_value.pop(id(entry["value"]), None)
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "digest": digest,
+                    "value": value,
+                    "derived": {},
+                }
+                self.entries.pop(key, None)
+                self.entries[key] = entry
+                self.by_value[id(value)] = entry
+                self.evict()
+            return value
+
+    def touch(self, key: Tuple[str, str]):
+        """Mark an entry as most recently used"""
+        with self.lock:
+            if key in self.entries:
+                self.entries[key] = self.entries.pop(key)
+
+    def evict(self):
+        """Drop entries of deleted files, then the least recently used over max_entries"""
+        # Called with self.lock held
+        for key in [key for key in self.entries if not os.path.exists(key[1])]:
+            self.remove(key)
+        while len(self.entries) > self.max_entries:
+            self.remove(next(iter(self.entries)))
+
+    def remove(self, key: Tuple[str, str]):
+        entry = self.entries.pop(key)
+        self.by_value.pop(id(entry["value"]), None)
+        self.locks.pop(key, None)
+        self.logger.info(f"Dropped cached {key[0]} of {key[1]}")
+
+    def derive(self, value: Any, name: str, build: Callable[[Any], Any]) -> Any:
+        """
+        build(value), memoized while value is the current contents of a cached file.
+        Values that did not come from the cache are built every time.
+        """
+        with self.lock:
+            entry = self.by_value.get(id(value))
+        if entry is None or entry["value"] is not value:
+            return build(value)
+
+        derived = entry["derived"]
+        if name not in derived:
+            # A concurrent first build is harmless, the last one is kept
+            derived[name] = build(value)
+        return derived[name]
+
+    def hash_file(self, path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as input_file:
+            for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def prune(self):
+        """Drop the entries of deleted files now, e.g. after an upload cleanup"""
+        with self.lock:
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.by_value.clear()
+
+
+PARSED_FILES = ParsedFileCache()
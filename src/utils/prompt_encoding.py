@@ -0,0 +1,130 @@
+"""Compact table encodings of stories and employees for LLM prompts"""
+
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from src.models.skill import ProficiencyLevel
+from src.models.story import Story
+
+LEVEL_CODES = {
+    ProficiencyLevel.BEGINNER: "B",
+    ProficiencyLevel.INTERMEDIATE: "I",
+    ProficiencyLevel.EXPERT: "E",
+}
+LEVEL_LEGEND = "B=Beginner, I=Intermediate, E=Expert"
+# Rough stand-in for the model tokenizer: words, numbers and single punctuation marks
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class PromptEncoder:
+    """
+    Renders stories and employees as pipe-separated tables with short ids (S1.., E1..)
+    instead of pydantic reprs, keeping only the columns a prompt needs, and maps the
+    short ids in the model's answer back to issue and employee ids.
+
+    Story descriptions are cut to description_chars and left out entirely when the
+    story table would exceed token_budget.
+    """
+
+    def __init__(self, description_chars: int = 200, token_budget: int = 6000, logger=None):
+        self.description_chars = description_chars
+        self.token_budget = token_budget
+        self.logger = logger or logging.getLogger(__name__)
+        self.story_ids: Dict[str, str] = {}
+        self.employee_ids: Dict[str, str] = {}
+
+    def count_tokens(self, text: str) -> int:
+        return len(TOKEN_PATTERN.findall(text))
+
+    def clean(self, value) -> str:
+        return " ".join(str(value).replace("|", "/").split())
+
+    def shorten(self, text: str) -> str:
+        text = self.clean(text)
+        if len(text) <= self.description_chars:
+            return text
+        return text[: self.description_chars].rsplit(" ", 1)[0] + "..."
+
+    def table(self, header: Sequence[str], rows: Iterable[Sequence]) -> str:
+        lines = ["|".join(header)]
+        lines.extend("|".join(self.clean(value) for value in row) for row in rows)
+        return "\n".join(lines)
+
+    def encode_stories(self, stories: List[Story], columns: Sequence[str] = ("epic", "title")) -> str:
+        """
+        Story table with an id column, the given Story fields and a description column
+        while it fits in the token budget. Ids follow the order of stories.
+        """
+        self.story_ids = {f"S{i}": story.issue_id for i, story in enumerate(stories, start=1)}
+        rows = [
+            [short_id, *(getattr(story, column) for column in columns)]
+            for short_id, story in zip(self.story_ids, stories)
+        ]
+
+        text = self.table(
+            ["id", *columns, "description"],
+            (row + [self.shorten(story.description)] for row, story in zip(rows, stories)),
+        )
+        if self.count_tokens(text) > self.token_budget:
+            self.logger.warning(
+                f"Story table over {self.token_budget} tokens, leaving out descriptions"
+            )
+            text = self.table(["id", *columns], rows)
+        return text
+
+    def encode_employees(
+        self,
+        employee_bandwidth: Dict[str, Dict],
+        skill_index=None,
+        skills: Optional[Iterable[str]] = None,
+    ) -> str:
+        """
+        Employee table of id, name, free days and skills with level codes. With a
+        skill_index and skills (index keys), only those skills are listed.
+        """
+        self.employee_ids = {
+            f"E{i}": emp_id for i, emp_id in enumerate(employee_bandwidth, start=1)
+        }
+        wanted = set(skills) if skills is not None else None
+        rows = []
+        for short_id, emp_id in self.employee_ids.items():
+            details = employee_bandwidth[emp_id]
+            if skill_index is not None and emp_id in skill_index.employee_skills:
+                employee_skills = [
+                    (skill_index.get_name(key), level)
+                    for key, level in skill_index.employee_skills[emp_id].items()
+                    if wanted is None or key in wanted
+                ]
+            else:
+                employee_skills = [
+                    (skill.skill_name, skill.proficiency) for skill in details.get("skills", [])
+                ]
+            rows.append(
+                [
+                    short_id,
+                    details.get("employee_name", ""),
+                    f"{details.get('bandwidth', 0):g}",
+                    ", ".join(f"{name}:{LEVEL_CODES[level]}" for name, level in employee_skills),
+                ]
+            )
+        return self.table(["id", "name", "free_days", "skills"], rows)
+
+    def decode_stories(self, short_ids: Iterable[str]) -> List[str]:
+        """Issue ids for story ids from the model, unknown ids are passed through"""
+        return [self.story_ids.get(self.clean(short_id), short_id) for short_id in short_ids]
+
+    def decode_mapping(self, mapping: Dict[str, str]) -> Dict[str, str]:
+        """{issue_id: emp_id} for a {story id: employee id} answer"""
+        return {
+            self.story_ids.get(self.clean(story_id), story_id): self.employee_ids.get(
+                self.clean(emp_id), emp_id
+            )
+            for story_id, emp_id in mapping.items()
+        }
+
+    def log_size(self, name: str, prompt_input: Dict[str, str]) -> int:
+        """Log and return the approximate token count of a prompt's input values"""
+        tokens = sum(self.count_tokens(str(value)) for value in prompt_input.values())
+        self.logger.info(f"{name} prompt input: ~{tokens} tokens")
+        return tokens
@@ -0,0 +1,122 @@
+"""Rate limiting, backoff and request metrics shared by the Jira clients"""
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD rate adaptation.
+
+    Each throttle (HTTP 429) pauses every caller and halves the rate; each success
+    creeps it back up towards the configured maximum, so the client settles just
+    under whatever the tenant allows.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 10
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it"""
+        with self.lock:
+            now = time.monotonic()
+            # updated is moved to the end of a pause, nothing refills before then
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            # Token debt is paid off after the pause, so queued callers are spaced out
+            ready = self.updated + max(0.0, -self.tokens) / self.rate
+            return max(0.0, ready - now)
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def throttle(self, delay: float):
+        """Pause all callers for delay seconds and back the rate off"""
+        with self.lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.paused_until = max(self.paused_until, now + delay)
+            self.updated = max(self.updated, self.paused_until)
+            self.tokens = min(self.tokens, 0.0)
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RequestMetrics:
+    """Per-endpoint request counts, retries and latency"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints: Dict[str, Dict[str, float]] = {}
+
+    def record(self, endpoint: str, latency: float, retries: int, failed: bool):
+        with self.lock:
+            stats = self.endpoints.setdefault(
+                endpoint,
+                {"requests": 0, "retries": 0, "errors": 0, "total_latency": 0.0, "max_latency": 0.0},
+            )
+            stats["requests"] += 1
+            stats["retries"] += retries
+            stats["errors"] += int(failed)
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self.lock:
+            return {
+                endpoint: {
+                    **stats,
+                    "avg_latency": stats["total_latency"] / stats["requests"],
+                }
+                for endpoint, stats in self.endpoints.items()
+            }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds, from either delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int, base: float, cap: float, retry_after: Optional[float] = None
+) -> float:
+    """Exponential backoff with full jitter, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(cap, base * 2**attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
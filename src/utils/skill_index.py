@@ -0,0 +1,177 @@
+"""Inverted index from normalized skill names to the employees who have them"""
+
+import csv
+import logging
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from src.models.employee import Employee
+from src.models.skill import ProficiencyLevel
+from src.models.story import Story
+from src.utils.parsed_file_cache import PARSED_FILES
+
+# Dots only inside a token ("node.js", "asp.net"), not at the end of a sentence
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+(?:\.[a-z0-9+#]+)*")
+PROFICIENCY_RANKS = {
+    ProficiencyLevel.BEGINNER: 1,
+    ProficiencyLevel.INTERMEDIATE: 2,
+    ProficiencyLevel.EXPERT: 3,
+}
+
+
+@lru_cache(maxsize=8)
+def load_aliases(path: str) -> Dict[str, str]:
+    """alias -> skill from the aliases CSV, empty when the file is missing"""
+    try:
+        with open(path, encoding="utf-8", newline="") as aliases_file:
+            return {row["alias"]: row["skill"] for row in csv.DictReader(aliases_file)}
+    except OSError as e:
+        logging.getLogger(__name__).warning(f"No skill aliases loaded from {path}: {e}")
+        return {}
+
+
+def get_skill_index(employee_data: Dict[str, Employee], settings) -> "SkillIndex":
+    """The SkillIndex of a roster, built once per roster file while it is unchanged"""
+    aliases = load_aliases(settings.SKILL_ALIASES_PATH)
+    return PARSED_FILES.derive(
+        employee_data, "skill_index", lambda employees: SkillIndex(employees, aliases)
+    )
+
+
+class SkillIndex:
+    """
+    Skill name -> proficiency level -> employee ids, over normalized skill names.
+
+    Names are lower-cased and tokenized, plural tokens are singularized and aliases
+    (whole names or single tokens, e.g. "k8s" -> "kubernetes", "langraph" -> "langgraph")
+    are resolved, so "Python", "python " and "PY" are one skill. The same normalization
+    applies to story text, so stories can be matched against the index.
+    """
+
+    def __init__(self, employee_data: Dict[str, Employee], aliases: Dict[str, str] = None):
+        self.aliases = {
+            self.tokenize(alias, resolve=False): self.tokenize(skill, resolve=False)
+            for alias, skill in (aliases or {}).items()
+        }
+        self.token_aliases = {
+            alias: skill for alias, skill in self.aliases.items() if " " not in alias
+        }
+        self.skills: Dict[str, Dict[ProficiencyLevel, List[str]]] = defaultdict(
+            lambda: {level: [] for level in PROFICIENCY_RANKS}
+        )
+        self.employee_skills: Dict[str, Dict[str, ProficiencyLevel]] = {}
+        self.names: Dict[str, str] = {}
+
+        for emp_id, employee in employee_data.items():
+            levels = {}
+            for skill in employee.skills:
+                key = self.normalize(skill.skill_name)
+                if not key:
+                    continue
+                self.names.setdefault(key, skill.skill_name.strip())
+                # An employee listing a skill twice counts at the higher level
+                if key not in levels or PROFICIENCY_RANKS[skill.proficiency] > PROFICIENCY_RANKS[levels[key]]:
+                    levels[key] = skill.proficiency
+            for key, level in levels.items():
+                self.skills[key][level].append(emp_id)
+            self.employee_skills[emp_id] = levels
+
+        self.skills = dict(self.skills)
+        # Token -> skills containing it, for matching free text
+        self.skills_by_token: Dict[str, List[str]] = defaultdict(list)
+        for key in self.skills:
+            for token in set(key.split()):
+                self.skills_by_token[token].append(key)
+
+    def singular(self, token: str) -> str:
+        if len(token) <= 3 or not token.isalpha():
+            return token
+        if token.endswith("ies"):
+            return token[:-3] + "y"
+        if token.endswith(("sses", "xes", "ches", "shes")):
+            return token[:-2]
+        if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+            return token[:-1]
+        return token
+
+    def tokenize(self, text: str, resolve: bool = True) -> str:
+        """Lower-cased singular tokens of text joined by spaces, with aliases resolved"""
+        tokens = [self.singular(token) for token in TOKEN_PATTERN.findall(text.lower())]
+        if not resolve:
+            return " ".join(tokens)
+        return " ".join(self.token_aliases.get(token, token) for token in tokens)
+
+    def normalize(self, name: str) -> str:
+        """The index key of a skill name"""
+        phrase = self.tokenize(name, resolve=False)
+        if phrase in self.aliases:
+            return self.aliases[phrase]
+        return self.tokenize(name)
+
+    def get_name(self, key: str) -> str:
+        """Display name of an index key, as first spelled in the roster"""
+        return self.names.get(key, key)
+
+    def who(
+        self,
+        skill: str,
+        min_level: ProficiencyLevel = ProficiencyLevel.BEGINNER,
+        bandwidth: Optional[Dict[str, float]] = None,
+        min_free: float = 0.0,
+    ) -> List[str]:
+        """
+        Employees with the skill at min_level or above, strongest first. With bandwidth,
+        only those with more than min_free days free, and ties go to the most free.
+        """
+        buckets = self.skills.get(self.normalize(skill))
+        if not buckets:
+            return []
+        min_rank = PROFICIENCY_RANKS[ProficiencyLevel(min_level)]
+        candidates = []
+        for level, emp_ids in buckets.items():
+            rank = PROFICIENCY_RANKS[level]
+            if rank < min_rank:
+                continue
+            for emp_id in emp_ids:
+                free = bandwidth.get(emp_id, 0) if bandwidth is not None else 0
+                if bandwidth is None or free > min_free:
+                    candidates.append((-rank, -free, emp_id))
+        return [emp_id for _, _, emp_id in sorted(candidates)]
+
+    def match(self, text: str) -> Set[str]:
+        """Index keys of the skills mentioned in text, every token of a skill must occur"""
+        tokens = set(self.tokenize(text).split())
+        return {
+            key
+            for token in tokens
+            for key in self.skills_by_token.get(token, ())
+            if set(key.split()) <= tokens
+        }
+
+    def story_skills(self, story: Story) -> Set[str]:
+        return self.match(f"{story.epic} {story.title} {story.description}")
+
+    def shortlist(
+        self,
+        stories: Iterable[Story],
+        bandwidth: Dict[str, float],
+        min_level: ProficiencyLevel = ProficiencyLevel.BEGINNER,
+        limit: int = 20,
+    ) -> List[str]:
+        """
+        Candidates for a batch of stories: employees with free capacity who have a skill
+        the stories mention, best coverage first, up to limit. When no story mentions a
+        known skill everyone with free capacity is a candidate.
+        """
+        coverage: Dict[str, int] = defaultdict(int)
+        for story in stories:
+            for key in self.story_skills(story):
+                for emp_id in self.who(key, min_level, bandwidth):
+                    coverage[emp_id] += 1
+
+        if not coverage:
+            free = [emp_id for emp_id, days in bandwidth.items() if days > 0]
+            return sorted(free, key=lambda emp_id: -bandwidth[emp_id])[:limit]
+        return sorted(coverage, key=lambda emp_id: (-coverage[emp_id], -bandwidth[emp_id]))[:limit]
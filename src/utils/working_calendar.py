@@ -0,0 +1,52 @@
+"""Working-day arithmetic on NumPy business-day arrays"""
+
+import datetime
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+
+DateLike = Union[datetime.date, np.datetime64]
+
+
+class WorkingCalendar:
+    """
+    Weekdays minus public holidays, backed by np.busday_count / np.busday_offset.
+
+    Date ranges are half-open, [start, end). Every method also accepts arrays of dates
+    so whole teams or horizons are computed in one vectorized call.
+    """
+
+    def __init__(self, holidays: Iterable[datetime.date] = (), weekmask: str = "1111100"):
+        self.holidays = np.unique(np.array(list(holidays), dtype="datetime64[D]"))
+        self.busdaycal = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+    def to_days(self, dates) -> np.ndarray:
+        return np.asarray(dates, dtype="datetime64[D]")
+
+    def is_working_day(self, dates) -> np.ndarray:
+        return np.is_busday(self.to_days(dates), busdaycal=self.busdaycal)
+
+    def count(self, start, end) -> np.ndarray:
+        """Working days in [start, end)"""
+        return np.busday_count(self.to_days(start), self.to_days(end), busdaycal=self.busdaycal)
+
+    def offset(self, start, working_days) -> np.ndarray:
+        """The working day working_days after start, rolling start forward to a working day"""
+        return np.busday_offset(
+            self.to_days(start), working_days, roll="forward", busdaycal=self.busdaycal
+        )
+
+    def working_days(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """The working days in [start, end) as datetime64[D]"""
+        days = np.arange(self.to_days(start), self.to_days(end), dtype="datetime64[D]")
+        return days[self.is_working_day(days)]
+
+    def end_date(self, start: datetime.date, working_days: int) -> Tuple[datetime.date, int]:
+        """
+        Exclusive end of a span of working_days working days starting at start,
+        i.e. the day after the last working day, and the number of working days in it.
+        """
+        if working_days <= 0:
+            return start, 0
+        last_day = self.offset(start, working_days - 1)
+        return (last_day + np.timedelta64(1, "D")).item(), working_days